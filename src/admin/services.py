@@ -1,5 +1,6 @@
 from uuid import UUID
 from sqlalchemy.exc import SQLAlchemyError
+from src.core.cache import principal_cache
 from src.core.dependecies import require_authenticated_admin_user_session, require_db_session, require_superuser
 from src.core.security import (
     create_session_token, 
@@ -17,7 +18,7 @@ from src.admin.tasks import send_admin_password_reset_mail
 from fastapi import Depends, Form, Path, Request, Response, status
 from sqlmodel import Session, select
 from typing import Annotated
-from src.core.sessions import cookie as SessionCookie
+from src.core.sessions import PrincipalType, cookie as SessionCookie
 
 
 def admin_user_login_service(
@@ -43,7 +44,9 @@ def admin_user_login_service(
             detail="This account is no longer active.",
         )
 
-    create_session_token(user_id=admin_user.id, response=response)
+    create_session_token(
+        user_id=admin_user.id, principal_type=PrincipalType.admin, response=response
+    )
     return admin_user
 
 
@@ -88,6 +91,7 @@ def admin_reset_password_service(
         user.password = get_password_hash(form_data.password)
         session.add(user)
         session.commit()
+        principal_cache.invalidate(user.id)
     except SQLAlchemyError as error:
         session.rollback()
         logger.error(f"Error resetting password: {error}")
@@ -175,4 +179,5 @@ def delete_admin_user(
 
     session.delete(user)
     session.commit()
+    principal_cache.invalidate(user_id)
 
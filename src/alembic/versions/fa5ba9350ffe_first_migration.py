@@ -111,6 +111,8 @@ def downgrade():
     op.drop_table('adminmaterial')
     op.drop_index(op.f('ix_material_status'), table_name='material')
     op.drop_table('material')
+    # native enum types outlive their table on postgresql
+    sa.Enum(name='materialstatus').drop(op.get_bind(), checkfirst=True)
     op.drop_index(op.f('ix_user_matric_number'), table_name='user')
     op.drop_index(op.f('ix_user_email'), table_name='user')
     op.drop_table('user')
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from redis import Redis
+from redis.client import PubSub, PubSubWorkerThread
+from redis.exceptions import RedisError
+from src.core.config import settings
+from src.libs.log import logger
+
+
+redis_client = Redis.from_url(
+    url=settings.CELERY_BROKER_URL,
+    decode_responses=True,
+)
+
+
+class PrincipalCache:
+    """
+    In-process TTL cache of authenticated principal snapshots.
+
+    Entries are keyed by session id and tagged with the principal id.
+    Invalidations are published on redis so every process evicts the
+    principal, entries are only served while that subscription is alive.
+    """
+
+    channel = "principal:invalidate"
+
+    def __init__(self, redis: Redis, ttl: int, maxsize: int) -> None:
+        self._redis = redis
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: OrderedDict[UUID, tuple[float, UUID, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener: PubSubWorkerThread | None = None
+
+    def get(self, session_id: UUID) -> Any | None:
+        """Return the cached snapshot of a session principal."""
+        if not self._ensure_listener():
+            return None
+
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            expires_at, _, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[session_id]
+                return None
+            self._entries.move_to_end(session_id)
+            return snapshot
+
+    def set(self, session_id: UUID, principal_id: UUID, snapshot: Any) -> None:
+        """Cache the snapshot of a session principal."""
+        if not self._ensure_listener():
+            return
+
+        with self._lock:
+            self._entries[session_id] = (
+                time.monotonic() + self._ttl, principal_id, snapshot,
+            )
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, principal_id: UUID) -> None:
+        """Evict a principal from the cache of every process."""
+        self._evict(principal_id)
+        try:
+            self._redis.publish(self.channel, str(principal_id))
+        except RedisError as error:
+            logger.error(f"Error publishing principal invalidation: {error}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, principal_id: UUID) -> None:
+        with self._lock:
+            for session_id in [
+                session_id for session_id, (_, cached_principal_id, _) in self._entries.items()
+                if cached_principal_id == principal_id
+            ]:
+                del self._entries[session_id]
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        self._evict(UUID(message["data"]))
+
+    def _handle_listener_error(
+        self, error: BaseException, pubsub: PubSub, thread: PubSubWorkerThread,
+    ) -> None:
+        # invalidations may have been missed, start over with an empty cache
+        logger.error(f"Principal cache invalidation listener failed: {error}")
+        thread.stop()
+        pubsub.close()
+        with self._lock:
+            self._listener = None
+            self._entries.clear()
+
+    def _ensure_listener(self) -> bool:
+        """Subscribe to invalidations the first time the cache is used."""
+        if self._ttl <= 0:
+            return False
+        if self._listener is not None:
+            return True
+
+        with self._lock:
+            if self._listener is None:
+                try:
+                    pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(**{self.channel: self._handle_message})
+                    self._listener = pubsub.run_in_thread(
+                        sleep_time=1,
+                        daemon=True,
+                        exception_handler=self._handle_listener_error,
+                    )
+                except RedisError as error:
+                    logger.error(f"Error subscribing to principal invalidations: {error}")
+                    return False
+        return True
+
+
+principal_cache = PrincipalCache(
+    redis=redis_client,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+)
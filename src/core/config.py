@@ -8,6 +8,7 @@ from pydantic import (
     computed_field,
     model_validator,
 )
+from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing_extensions import Self
 from libcloud.storage.base import Container
@@ -41,9 +42,50 @@ class Settings(BaseSettings):
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     PROJECT_NAME: str
     SENTRY_DSN: HttpUrl | None = None
+    DATABASE_BACKEND: Literal["sqlite", "postgresql"] = "sqlite"
     SQLITE_DATABASE_PATH: str
     TEST_DATABASE_PATH: str
+    POSTGRES_SERVER: str = "localhost"
+    POSTGRES_PORT: int = 5432
+    POSTGRES_USER: str = "postgres"
+    POSTGRES_PASSWORD: str = ""
+    POSTGRES_DB: str = "material_ranker"
+    POSTGRES_TEST_DB: str = "material_ranker_test"
+    # read only queries go to this database when set, e.g. a replica
+    DATABASE_READ_REPLICA_URI: str | None = None
     SESSION_COOKIE_TTL: int = 7 * 24 * 60 * 60 # 7 days
+    PRINCIPAL_CACHE_TTL: int = 60  # seconds, 0 disables the cache
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    LIST_PAGE_SIZE: int = 24
+    DASHBOARD_CACHE_TTL: int = 30  # seconds, 0 disables the cache
+    # queue votes in redis and apply them in batches from a celery task
+    RATING_WRITE_BEHIND: bool = False
+    RATING_WRITE_BEHIND_DELAY: int = 2  # seconds
+    RATING_WRITE_BEHIND_BATCH_SIZE: int = 500
+    # attempts before a vote that keeps failing is moved to a dead letter stream
+    RATING_WRITE_BEHIND_MAX_ATTEMPTS: int = 3
+    # materials fetched and parsed at a time when the model is trained
+    TRAIN_BATCH_SIZE: int = 50
+    TRAIN_PARSER_WORKERS: int = 4
+    # the training lock expires unless the running task renews it
+    TRAINING_LOCK_TIMEOUT: int = 60  # seconds
+    TRAINING_SCHEDULE_TIMEOUT: int = 15 * 60  # seconds
+    TRAINING_PROGRESS_TTL: int = 24 * 60 * 60  # 1 day
+
+    # Database engine settings
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30  # seconds
+    DATABASE_POOL_RECYCLE: int = 30 * 60  # 30 minutes
+    # applied to every new sqlite connection
+    SQLITE_PRAGMAS: dict[str, str | int] = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,  # ms
+        "cache_size": -64000,  # 64mb
+        "mmap_size": 256 * 1024 * 1024,  # 256mb
+        "temp_store": "MEMORY",
+    }
 
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
@@ -70,6 +112,8 @@ class Settings(BaseSettings):
 
     FILE_STORAGE_CONTAINER_NAME: str = "upload"
     MEDIA_FILE_MAX_SIZE: str = "50M"  # 50mb
+    CHUNKED_UPLOAD_CHUNK_SIZE: int = 5 * 1024 * 1024  # 5mb
+    CHUNKED_UPLOAD_TTL: int = 24 * 60 * 60  # 1 day
     MEDIA_MATERIAL_ALLOWED_CONTENT_TYPES: list[str] = ["application/pdf"]
     MEDIA_IMAGE_ALLOWED_CONTENT_TYPES: list[str] = [
         "image/jpeg",
@@ -78,10 +122,26 @@ class Settings(BaseSettings):
         "image/bmp",
         "image/tiff",
     ]
+    COVER_THUMBNAIL_WIDTHS: list[int] = [320, 640]
+    COVER_THUMBNAIL_QUALITY: int = 80
 
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
+        if self.DATABASE_BACKEND == "postgresql":
+            return str(MultiHostUrl.build(
+                scheme="postgresql+psycopg",
+                username=self.POSTGRES_USER,
+                password=self.POSTGRES_PASSWORD,
+                host=self.POSTGRES_SERVER,
+                port=self.POSTGRES_PORT,
+                path=(
+                    self.POSTGRES_DB
+                    if self.ENVIRONMENT in ["local", "production"]
+                    else self.POSTGRES_TEST_DB
+                ),
+            ))
+
         path = (
             os.path.realpath(self.SQLITE_DATABASE_PATH)
             if self.ENVIRONMENT in ["local", "production"]
@@ -1,11 +1,107 @@
 import logging
+from collections.abc import Callable
+from typing import Any
 
+from sqlalchemy import Engine, event, make_url
+from sqlalchemy.pool import QueuePool
 from sqlmodel import Session, create_engine, select
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+# pragmas that write to the database file, they fail on read only connections
+SQLITE_WRITE_PRAGMAS = ("journal_mode", "synchronous")
+
+
+def _sqlite_pragma_setter(pragmas: dict[str, str | int]) -> Callable[[Any, Any], None]:
+    """Build a connect listener that applies the given pragmas."""
+
+    def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+    return set_sqlite_pragmas
+
+
+def create_db_engine(
+    database_uri: str, sqlite_pragmas: dict[str, str | int] | None = None,
+) -> Engine:
+    """
+    Create the database engine for the configured backend.
+
+    Connections are pooled so that web requests and celery tasks reuse
+    them instead of reconnecting on every session. Sqlite connections are
+    shared between threads and tuned with `SQLITE_PRAGMAS` when they
+    connect, or with `sqlite_pragmas` when given. Server connections are
+    checked before use and recycled.
+    """
+    pool_options: dict[str, Any] = {
+        "poolclass": QueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    }
+
+    if make_url(database_uri).get_backend_name() != "sqlite":
+        return create_engine(
+            database_uri,
+            pool_pre_ping=True,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            **pool_options,
+        )
+
+    db_engine = create_engine(
+        database_uri,
+        connect_args={"check_same_thread": False},
+        **pool_options,
+    )
+    event.listen(
+        db_engine,
+        "connect",
+        _sqlite_pragma_setter(
+            settings.SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+        ),
+    )
+    return db_engine
+
+def create_read_only_db_engine(database_uri: str) -> Engine:
+    """
+    Create an engine for read only sessions.
+
+    Sqlite databases are opened with `mode=ro` and `query_only` and only
+    get the pragmas that do not write, server databases start read only
+    transactions.
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() != "sqlite":
+        return create_db_engine(database_uri).execution_options(
+            postgresql_readonly=True
+        )
+
+    return create_db_engine(
+        url.set(
+            database=f"file:{url.database}",
+            query={**url.query, "mode": "ro", "uri": "true"},
+        ).render_as_string(hide_password=False),
+        sqlite_pragmas={
+            **{
+                pragma: value for pragma, value in settings.SQLITE_PRAGMAS.items()
+                if pragma not in SQLITE_WRITE_PRAGMAS
+            },
+            "query_only": "ON",
+        },
+    )
+
+
+engine = create_db_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+read_only_engine = create_read_only_db_engine(
+    settings.DATABASE_READ_REPLICA_URI or str(settings.SQLALCHEMY_DATABASE_URI)
+)
 
 
 # make sure all SQLModel models are imported (src.models) before initializing DB
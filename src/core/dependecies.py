@@ -1,15 +1,17 @@
 from collections.abc import Generator
 from uuid import UUID
 from fastapi import Depends, Request, Response, status
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session
-from src.core.db import engine
+from src.core.cache import principal_cache
+from src.core.db import engine, read_only_engine
 from typing import Annotated
 from src.models import AdminUser, User
-from sqlmodel import select
 from src.libs.exceptions import AuthenticationError
 from src.core.sessions import (
     cookie as session_cookie, 
     verifier as session_verifier, 
+    PrincipalType,
     SessionData,
 )
 
@@ -22,38 +24,76 @@ def require_db_session() -> Generator[Session, None, None]:
         yield session
 
 
-def require_authenticated_user_session(
+def require_read_only_db_session() -> Generator[Session, None, None]:
+    """Get a new read only database session for list, search and dashboard queries."""
+
+    with Session(read_only_engine) as session:
+        yield session
+
+
+def resolve_session_principal(
+    request: Request,
     db_session: Annotated[Session, Depends(require_db_session)],
     session_id: Annotated[UUID, Depends(session_cookie)],
     session_data: Annotated[SessionData, Depends(session_verifier)]
+) -> User | AdminUser | None:
+    """
+    Load the user or admin user the session belongs to.
+
+    The principal is looked up once per request and kept on
+    `request.state` for every dependency that needs it. Snapshots are
+    cached in process for `PRINCIPAL_CACHE_TTL` seconds.
+    """
+    if hasattr(request.state, "principal"):
+        return request.state.principal
+
+    principal: User | AdminUser | None = None
+    if snapshot := principal_cache.get(session_id):
+        # attach the cached snapshot to the session without querying
+        model, data = snapshot
+        principal = model(**data)
+        make_transient_to_detached(principal)
+        principal = db_session.merge(principal, load=False)
+    else:
+        if session_data.principal_type != PrincipalType.admin:
+            principal = db_session.get(User, session_data.id)
+        if not principal and session_data.principal_type != PrincipalType.user:
+            principal = db_session.get(AdminUser, session_data.id)
+        if principal:
+            principal_cache.set(
+                session_id, principal.id, (type(principal), principal.model_dump()),
+            )
+
+    request.state.principal = principal
+    return principal
+
+
+def require_authenticated_user_session(
+    principal: Annotated[User | AdminUser | None, Depends(resolve_session_principal)],
 ) -> User:
     """Return authenticated user."""
 
-    user = db_session.exec(select(User).where(User.id == session_data.id)).first()
-    if not user:
+    if not isinstance(principal, User):
         raise AuthenticationError(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Unauthorized"
         )  
     
-    return user
+    return principal
 
 
 def require_authenticated_admin_user_session(
-    db_session: Annotated[Session, Depends(require_db_session)],
-    session_id: Annotated[UUID, Depends(session_cookie)],
-    session_data: Annotated[SessionData, Depends(session_verifier)]
+    principal: Annotated[User | AdminUser | None, Depends(resolve_session_principal)],
 ) -> AdminUser:
     """Return authenticated user."""
 
-    user = db_session.exec(select(AdminUser).where(AdminUser.id == session_data.id)).first()
-    if not user:
+    if not isinstance(principal, AdminUser):
         raise AuthenticationError(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Unauthorized"
         )  
 
-    return user
+    return principal
 
 
 def require_superuser(
@@ -70,22 +110,17 @@ def require_superuser(
 
 
 def require_admin_or_user_access(
-    db_session: Annotated[Session, Depends(require_db_session)],
-    session_id: Annotated[UUID, Depends(session_cookie)],
-    session_data: Annotated[SessionData, Depends(session_verifier)]
+    principal: Annotated[User | AdminUser | None, Depends(resolve_session_principal)],
 ) -> User | AdminUser:
     """Require either authenticated admin or user."""
 
-    user = db_session.exec(select(User).where(User.id == session_data.id)).first()
-    admin = db_session.exec(select(AdminUser).where(AdminUser.id == session_data.id)).first()
-
-    if not user and not admin:
+    if not principal:
         raise AuthenticationError(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Unauthorized"
         )  
 
-    return user or admin
+    return principal
 
 
 def check_htmx_request(request: Request) -> bool:
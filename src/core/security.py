@@ -9,6 +9,7 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from src.core.config import settings
 from src.core.sessions import (
+    PrincipalType,
     SessionData, 
     backend as session_backend,
     cookie as session_cookie
@@ -29,10 +30,15 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_session_token(user_id: UUID, response: Response) -> None:
+def create_session_token(
+    user_id: UUID, principal_type: PrincipalType, response: Response
+) -> None:
     """Create a new session and attach it to the response."""
     session_token = uuid4()
-    session_backend.create(session_id=session_token, data=SessionData(id=user_id))
+    session_backend.create(
+        session_id=session_token,
+        data=SessionData(id=user_id, principal_type=principal_type),
+    )
     session_cookie.attach_to_response(response, session_token)
 
 
@@ -1,7 +1,9 @@
+from enum import StrEnum
 from pydantic import BaseModel
 from uuid import UUID
 
 from redis import Redis
+from src.core.cache import redis_client
 from src.core.config import settings
 
 from typing import Generic
@@ -19,8 +21,15 @@ from fastapi import HTTPException, Request
 from redis.commands.json.path import Path
 
 
+class PrincipalType(StrEnum):
+    user = "user"
+    admin = "admin"
+
+
 class SessionData(BaseModel):
     id: UUID
+    # not recorded on sessions created before principal types were tracked
+    principal_type: PrincipalType | None = None
     ttl: int = settings.SESSION_COOKIE_TTL
 
 
@@ -146,11 +155,7 @@ cookie = SessionCookie(
 )
 
 
-backend = RedisSessionBackend[UUID, SessionData](session=Redis.from_url(
-        url=settings.CELERY_BROKER_URL, 
-        decode_responses=True,
-    )
-)
+backend = RedisSessionBackend[UUID, SessionData](session=redis_client)
 
 
 verifier = BasicVerifier(
@@ -0,0 +1,285 @@
+import contextlib
+import hashlib
+import io
+import json
+import uuid
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any, BinaryIO
+
+from fastapi import UploadFile
+from libcloud.storage.types import ObjectDoesNotExistError
+from PIL import Image
+from sqlalchemy_file import File
+from sqlalchemy_file.exceptions import ContentTypeValidationError, SizeValidationError
+from sqlalchemy_file.helpers import convert_size
+from sqlalchemy_file.storage import StorageManager
+
+from src.core.config import settings
+
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1mb
+
+# Leading bytes used to confirm the declared content type of an upload.
+CONTENT_SIGNATURES: dict[str, tuple[bytes, ...]] = {
+    "application/pdf": (b"%PDF-",),
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/webp": (b"RIFF",),
+    "image/bmp": (b"BM",),
+    "image/tiff": (b"II*\x00", b"MM\x00*"),
+}
+
+
+def iter_file_chunks(
+    file: BinaryIO, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Read a file object in fixed size chunks."""
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+def _validate_content_type(
+    content_type: str, allowed_content_types: list[str], attr_key: str,
+) -> None:
+    """Reject uploads whose declared content type is not allowed."""
+    if content_type not in allowed_content_types:
+        raise ContentTypeValidationError(
+            attr_key,
+            f"File content_type {content_type} is not allowed. "
+            f"Allowed content_types are: {allowed_content_types}",
+        )
+
+
+def _validate_chunks(
+    chunks: Iterable[bytes],
+    content_type: str,
+    max_size: int,
+    attr_key: str,
+    checksum: "hashlib._Hash",
+) -> Iterator[bytes]:
+    """Validate size and file signature while the upload is being streamed."""
+    size = 0
+    for index, chunk in enumerate(chunks):
+        if index == 0:
+            signatures = CONTENT_SIGNATURES.get(content_type)
+            if signatures and not chunk.startswith(signatures):
+                raise ContentTypeValidationError(
+                    attr_key, f"File content does not match content_type {content_type}."
+                )
+
+        size += len(chunk)
+        if size > max_size:
+            raise SizeValidationError(
+                attr_key,
+                f"The file is too large. Allowed maximum size is {max_size} bytes.",
+            )
+
+        checksum.update(chunk)
+        yield chunk
+
+
+def stream_to_storage(
+    chunks: Iterable[bytes],
+    filename: str,
+    content_type: str,
+    allowed_content_types: list[str],
+    attr_key: str,
+    max_size: int | str = settings.MEDIA_FILE_MAX_SIZE,
+    upload_storage: str = settings.FILE_STORAGE_CONTAINER_NAME,
+) -> File:
+    """
+    Stream file chunks into storage and return a saved `File`.
+
+    Size, content type and the sha256 checksum are computed chunk by chunk,
+    so the upload is never held in memory and no database session is needed.
+    The returned `File` is already marked as saved, assigning it to a
+    `FileField` column only writes its metadata to the database.
+    """
+    _validate_content_type(content_type, allowed_content_types, attr_key)
+
+    file_id = str(uuid.uuid4())
+    checksum = hashlib.sha256()
+    container = StorageManager.get(upload_storage)
+
+    try:
+        stored_object = container.upload_object_via_stream(
+            iterator=_validate_chunks(
+                chunks,
+                content_type=content_type,
+                max_size=convert_size(max_size),
+                attr_key=attr_key,
+                checksum=checksum,
+            ),
+            object_name=file_id,
+            extra={"content_type": content_type},
+        )
+    except Exception:
+        # remove whatever was written before validation failed
+        with contextlib.suppress(ObjectDoesNotExistError):
+            container.get_object(file_id).delete()
+        raise
+
+    meta_data = {
+        "filename": filename,
+        "content_type": content_type,
+        "sha256": checksum.hexdigest(),
+    }
+    # local storage does not support object metadata, sqlalchemy-file
+    # keeps it in a sidecar json object instead.
+    container.upload_object_via_stream(
+        iterator=iter([json.dumps(meta_data).encode()]),
+        object_name=f"{file_id}.metadata.json",
+    )
+
+    try:
+        url = stored_object.get_cdn_url()
+    except NotImplementedError:
+        url = None
+
+    path = f"{upload_storage}/{file_id}"
+    return File(
+        content={
+            "filename": filename,
+            "content_type": content_type,
+            "size": stored_object.size,
+            "sha256": meta_data["sha256"],
+            "files": [path],
+            "file_id": file_id,
+            "upload_storage": upload_storage,
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+            "path": path,
+            "url": url,
+            "saved": True,
+        }
+    )
+
+
+def load_stored_file(data: dict) -> File:
+    """Rebuild a saved `File` from its serialized form."""
+    return File(content=data)
+
+
+def stream_upload_to_storage(
+    upload: UploadFile,
+    allowed_content_types: list[str],
+    attr_key: str,
+    max_size: int | str = settings.MEDIA_FILE_MAX_SIZE,
+) -> File:
+    """Stream a multipart upload into storage in chunks."""
+    upload.file.seek(0)
+    return stream_to_storage(
+        chunks=iter_file_chunks(upload.file),
+        filename=upload.filename or "unnamed",
+        content_type=upload.content_type or "application/octet-stream",
+        allowed_content_types=allowed_content_types,
+        attr_key=attr_key,
+        max_size=max_size,
+    )
+
+
+def _upload_part_name(upload_id: str, index: int) -> str:
+    return f"{upload_id}.part{index:05d}"
+
+
+def store_upload_part(
+    upload_id: str,
+    index: int,
+    chunks: Iterable[bytes],
+    upload_storage: str = settings.FILE_STORAGE_CONTAINER_NAME,
+) -> int:
+    """Store a single part of a chunked upload and return its size."""
+    container = StorageManager.get(upload_storage)
+    stored_object = container.upload_object_via_stream(
+        iterator=iter(chunks), object_name=_upload_part_name(upload_id, index),
+    )
+    return stored_object.size
+
+
+def iter_upload_parts(
+    upload_id: str,
+    total_parts: int,
+    upload_storage: str = settings.FILE_STORAGE_CONTAINER_NAME,
+) -> Iterator[bytes]:
+    """Read back the parts of a chunked upload in order."""
+    container = StorageManager.get(upload_storage)
+    for index in range(total_parts):
+        part = container.get_object(_upload_part_name(upload_id, index))
+        yield from part.as_stream(chunk_size=UPLOAD_CHUNK_SIZE)
+
+
+def delete_upload_parts(
+    upload_id: str,
+    indexes: Iterable[int],
+    upload_storage: str = settings.FILE_STORAGE_CONTAINER_NAME,
+) -> None:
+    """Delete the given stored parts of a chunked upload."""
+    container = StorageManager.get(upload_storage)
+    for index in indexes:
+        with contextlib.suppress(ObjectDoesNotExistError):
+            container.get_object(_upload_part_name(upload_id, index)).delete()
+
+
+def create_image_thumbnails(
+    image: File,
+    widths: list[int],
+    quality: int = settings.COVER_THUMBNAIL_QUALITY,
+) -> list[File]:
+    """
+    Store WebP thumbnails of a saved image, one for each width.
+
+    Images are only scaled down and keep their aspect ratio, the width and
+    height of every thumbnail are saved alongside its file metadata.
+    """
+    with Image.open(io.BytesIO(image.file.read())) as source:
+        source.load()
+        name = image["filename"].rsplit(".", 1)[0]
+        thumbnails: list[File] = []
+
+        try:
+            for width in sorted(set(widths)):
+                thumbnail = source.copy()
+                thumbnail.thumbnail((width, source.height * width // source.width or 1))
+                if thumbnails and thumbnails[-1]["width"] == thumbnail.width:
+                    # the image is narrower than the requested width
+                    continue
+                if thumbnail.mode not in ("RGB", "RGBA"):
+                    thumbnail = thumbnail.convert("RGBA")
+
+                output = io.BytesIO()
+                thumbnail.save(output, "WEBP", quality=quality)
+                stored = stream_to_storage(
+                    chunks=[output.getvalue()],
+                    filename=f"{name}.{thumbnail.width}w.webp",
+                    content_type="image/webp",
+                    allowed_content_types=["image/webp"],
+                    attr_key="cover_thumbnails",
+                    upload_storage=image["upload_storage"],
+                )
+                thumbnails.append(File(content={
+                    **stored, "width": thumbnail.width, "height": thumbnail.height,
+                }))
+        except Exception:
+            for stored_thumbnail in thumbnails:
+                delete_stored_file(stored_thumbnail)
+            raise
+
+    return thumbnails
+
+
+def build_srcset(files: Sequence[Mapping[str, Any]] | None) -> str | None:
+    """Build an image `srcset` from stored files that record their width."""
+    if not files:
+        return None
+    return ", ".join(f"/media/{file['file_id']} {file['width']}w" for file in files)
+
+
+def delete_stored_file(file: File | None) -> None:
+    """Delete every stored object that belongs to a saved `File`."""
+    if not file:
+        return
+
+    for path in file.get("files", []):
+        with contextlib.suppress(ObjectDoesNotExistError):
+            StorageManager.delete_file(path)
+
@@ -0,0 +1,41 @@
+from typing import cast
+
+from redis.exceptions import RedisError
+
+from src.core.cache import redis_client
+from src.core.config import settings
+from src.libs.log import logger
+from src.material.schemas import AdminDashboardDetails
+
+
+DASHBOARD_CACHE_KEY = "admin:dashboard"
+
+
+def get_cached_dashboard_details() -> AdminDashboardDetails | None:
+    """Return the cached admin dashboard counts."""
+    try:
+        data = cast(str | None, redis_client.get(DASHBOARD_CACHE_KEY))
+    except RedisError as error:
+        logger.error(f"Error reading dashboard cache: {error}")
+        return None
+    return AdminDashboardDetails.model_validate_json(data) if data else None
+
+
+def cache_dashboard_details(details: AdminDashboardDetails) -> None:
+    """Cache the admin dashboard counts for a short while."""
+    if settings.DASHBOARD_CACHE_TTL <= 0:
+        return
+    try:
+        redis_client.set(
+            DASHBOARD_CACHE_KEY, details.model_dump_json(), ex=settings.DASHBOARD_CACHE_TTL,
+        )
+    except RedisError as error:
+        logger.error(f"Error writing dashboard cache: {error}")
+
+
+def invalidate_dashboard_details() -> None:
+    """Drop the cached counts after a material changes status."""
+    try:
+        redis_client.delete(DASHBOARD_CACHE_KEY)
+    except RedisError as error:
+        logger.error(f"Error invalidating dashboard cache: {error}")
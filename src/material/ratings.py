@@ -0,0 +1,201 @@
+from typing import cast
+from uuid import UUID
+
+from sqlalchemy import Float
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select, col, update
+
+from src.core.cache import redis_client
+from src.models import Material, MaterialRating, UserMaterial
+
+
+# write-behind mode, votes are appended to this stream and applied in batches
+RATING_STREAM = "material:ratings"
+RATING_STREAM_SCHEDULED_KEY = "material:ratings:scheduled"
+RATING_STREAM_LOCK_KEY = "material:ratings:lock"
+# failed attempts per vote, votes that keep failing go to the dead letter stream
+RATING_STREAM_FAILURES_KEY = "material:ratings:failures"
+RATING_DEAD_LETTER_STREAM = "material:ratings:dead"
+
+# only forget a pending vote if it was not replaced while being applied
+_forget_pending_rating = redis_client.register_script(
+    """
+    if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+        return redis.call('HDEL', KEYS[1], ARGV[1])
+    end
+    return 0
+    """
+)
+
+
+def _upsert_material_rating(
+    session: Session, material_id: UUID, user_id: UUID, rating: int,
+) -> int | None:
+    """
+    Insert the rating of a user or replace their previous one.
+
+    Returns the previous rating, `None` for a first vote. A first vote is
+    only counted by the statement that inserted the row, concurrent first
+    votes wait on it and are applied as re-rates.
+    """
+    dialect = session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    inserted = session.execute(
+        insert(MaterialRating).values(
+            user_id=user_id, material_id=material_id, rating=rating,
+        ).on_conflict_do_nothing(
+            index_elements=["user_id", "material_id"],
+        ).returning(col(MaterialRating.rating))
+    ).first()
+    if inserted is not None:
+        return None
+
+    # the row exists, lock it so concurrent re-rates read the latest rating
+    previous_rating = session.exec(
+        select(MaterialRating.rating).where(
+            MaterialRating.user_id == user_id,
+            MaterialRating.material_id == material_id,
+        ).with_for_update()
+    ).one()
+    session.execute(
+        update(MaterialRating).where(
+            col(MaterialRating.user_id) == user_id,
+            col(MaterialRating.material_id) == material_id,
+        ).values(rating=rating)
+    )
+    return previous_rating
+
+
+def _update_material_rating(
+    session: Session, material_id: UUID, rating: int, previous_rating: int | None,
+) -> None:
+    """Move the running rating totals of a material by a vote."""
+    rating_sum = col(Material.rating_sum) + rating - (previous_rating or 0)
+    rating_count = col(Material.rating_count) + (1 if previous_rating is None else 0)
+    session.execute(
+        update(Material).where(col(Material.id) == material_id).values(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            average_rating=rating_sum.cast(Float) / rating_count,
+        )
+    )
+
+
+def apply_material_rating(
+    session: Session, material_id: UUID, user_id: UUID, rating: int,
+) -> bool:
+    """
+    Record a vote and update the material totals, without committing.
+
+    Materials recommended by the user are not rated, `False` is returned
+    for them.
+    """
+    recommended = session.exec(
+        select(UserMaterial.user_id).where(
+            UserMaterial.user_id == user_id,
+            UserMaterial.material_id == material_id,
+        )
+    ).first()
+    if recommended is not None:
+        return False
+
+    # the totals move by what the upsert replaced, not by a prior read
+    previous_rating = _upsert_material_rating(
+        session=session,
+        material_id=material_id,
+        user_id=user_id,
+        rating=rating,
+    )
+    _update_material_rating(
+        session=session,
+        material_id=material_id,
+        rating=rating,
+        previous_rating=previous_rating,
+    )
+    return True
+
+
+def _pending_ratings_key(material_id: UUID) -> str:
+    return f"material:{material_id}:pending_ratings"
+
+
+def queue_material_rating(material_id: UUID, user_id: UUID, rating: int) -> None:
+    """Append a vote to the rating stream and remember it as pending."""
+    pipeline = redis_client.pipeline()
+    pipeline.hset(_pending_ratings_key(material_id), str(user_id), str(rating))
+    pipeline.xadd(
+        RATING_STREAM,
+        {"material_id": str(material_id), "user_id": str(user_id), "rating": str(rating)},
+    )
+    pipeline.execute()
+
+
+def get_pending_rating(material_id: UUID, user_id: UUID) -> int | None:
+    """Return the vote of a user that has not been applied yet."""
+    rating = cast(
+        str | None, redis_client.hget(_pending_ratings_key(material_id), str(user_id)),
+    )
+    return int(rating) if rating is not None else None
+
+
+def read_queued_ratings(
+    count: int,
+) -> tuple[dict[tuple[UUID, UUID], list[str]], dict[tuple[UUID, UUID], int]]:
+    """
+    Read the oldest votes from the rating stream.
+
+    Repeated votes of a user on a material are coalesced, only the latest
+    one is returned for each (material_id, user_id) pair along with the
+    ids of all its stream entries.
+    """
+    entries = cast(
+        list[tuple[str, dict[str, str]]], redis_client.xrange(RATING_STREAM, count=count),
+    )
+    entry_ids: dict[tuple[UUID, UUID], list[str]] = {}
+    ratings: dict[tuple[UUID, UUID], int] = {}
+    for entry_id, fields in entries:
+        key = (UUID(fields["material_id"]), UUID(fields["user_id"]))
+        entry_ids.setdefault(key, []).append(entry_id)
+        ratings[key] = int(fields["rating"])
+    return entry_ids, ratings
+
+
+def forget_queued_ratings(
+    entry_ids: dict[tuple[UUID, UUID], list[str]],
+    ratings: dict[tuple[UUID, UUID], int],
+) -> None:
+    """Remove the given votes from the rating stream and the pending votes."""
+    if not ratings:
+        return
+    redis_client.xdel(RATING_STREAM, *(
+        entry_id for key in ratings for entry_id in entry_ids[key]
+    ))
+    redis_client.hdel(RATING_STREAM_FAILURES_KEY, *map(_rating_field, ratings))
+    for (material_id, user_id), rating in ratings.items():
+        _forget_pending_rating(
+            keys=[_pending_ratings_key(material_id)], args=[str(user_id), rating],
+        )
+
+
+def _rating_field(key: tuple[UUID, UUID]) -> str:
+    material_id, user_id = key
+    return f"{material_id}:{user_id}"
+
+
+def record_queued_rating_failure(key: tuple[UUID, UUID]) -> int:
+    """Count a failed attempt to apply a vote, returns the attempts so far."""
+    return cast(int, redis_client.hincrby(RATING_STREAM_FAILURES_KEY, _rating_field(key), 1))
+
+
+def dead_letter_queued_rating(key: tuple[UUID, UUID], rating: int, error: str) -> None:
+    """Keep a vote that can not be applied aside for inspection."""
+    material_id, user_id = key
+    redis_client.xadd(
+        RATING_DEAD_LETTER_STREAM,
+        {
+            "material_id": str(material_id),
+            "user_id": str(user_id),
+            "rating": str(rating),
+            "error": error,
+        },
+    )
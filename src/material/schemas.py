@@ -1,7 +1,20 @@
-from typing import Literal
+from typing import Any, Generic, Literal, TypeVar
 from fastapi import UploadFile
-from pydantic import UUID4, BaseModel, AnyUrl
-from datetime import datetime
+from pydantic import UUID4, BaseModel, AnyUrl, Field, PositiveInt
+from datetime import datetime, timezone
+from src.libs.storage import build_srcset
+from src.models import MaterialStatus
+
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """A page of a keyset paginated list."""
+    items: list[T]
+    # cursor the page was requested after, `None` for the first page
+    after: str | None = None
+    next_cursor: str | None = None
 
 
 class MaterailRecommendation(BaseModel):
@@ -13,8 +26,89 @@ class MaterailRecommendation(BaseModel):
     recommendation_datetime: datetime
     
 
+class MaterialCard(BaseModel):
+    """Fields needed to render a material on the catalog pages."""
+    id: UUID4
+    title: str
+    authors: str
+    average_rating: float | None
+    cover_image_id: str | None
+    cover_thumbnails: list[dict[str, Any]] | None
+
+    @property
+    def cover_image_url(self) -> str | None:
+        return f"/media/{self.cover_image_id}" if self.cover_image_id else None
+
+    @property
+    def cover_thumbnail_srcset(self) -> str | None:
+        return build_srcset(self.cover_thumbnails)
+
+    @property
+    def normalized_average_rating(self) -> float:
+        """Normalize average rating."""
+        rating = 1.0 if self.average_rating is None else self.average_rating
+        return (rating - 1) / 4
+
+
+class AdminMaterialRow(BaseModel):
+    """Fields needed to render a material on the admin tables."""
+    id: UUID4
+    title: str
+    status: MaterialStatus
+    content_size: int | None
+    created_datetime: datetime
+
+
 class AdminDashboardDetails(BaseModel):
     user_count: int
     material_count: int
     pending_review_count: int
     pending_unvectorization_count: int
+
+
+TrainingStage = Literal[
+    "scheduled", "snapshot", "parsing", "publishing", "finished", "failed",
+]
+
+
+class TrainingProgress(BaseModel):
+    """Progress of the running or last vectorization."""
+    stage: TrainingStage
+    processed: int = 0
+    total: int = 0
+    started_datetime: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def is_running(self) -> bool:
+        return self.stage not in ("finished", "failed")
+
+    @property
+    def percentage(self) -> int:
+        return self.processed * 100 // self.total if self.total else 0
+
+    @property
+    def eta_seconds(self) -> int | None:
+        """Seconds left to parse the remaining materials at the current rate."""
+        if self.stage != "parsing" or not self.processed:
+            return None
+        elapsed = (datetime.now(timezone.utc) - self.started_datetime).total_seconds()
+        return round(elapsed / self.processed * (self.total - self.processed))
+
+
+class ChunkedUploadForm(BaseModel):
+    filename: str
+    content_type: str
+    size: PositiveInt
+
+
+class ChunkedUpload(BaseModel):
+    upload_id: UUID4
+    owner_id: UUID4
+    filename: str
+    content_type: str
+    size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: list[int] = []
+    completed: bool = False
+    file: dict[str, Any] | None = Field(default=None, exclude=True)
@@ -1,25 +1,265 @@
+import math
+import uuid
+from collections.abc import Sequence
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
 from fastapi import Depends, Query, UploadFile, status, File, Form, Path
-from typing import Annotated
+from typing import Annotated, cast
 from pydantic import AnyUrl, UUID4
-from sqlmodel import Session, select, col, func
+from redis.commands.json.path import Path as JsonPath
+from redis.exceptions import RedisError
+from sqlmodel import Session, select, col, func, update
+from src.core.cache import redis_client
 from src.core.dependecies import (
     require_admin_or_user_access,
     require_db_session, 
+    require_read_only_db_session,
     require_authenticated_admin_user_session,
     require_authenticated_user_session,
 )
-from src.libs.exceptions import ServiceError
-from src.libs.utils import CeleryHelper
-from src.material.schemas import AdminDashboardDetails, MaterailRecommendation
-from src.material.tfid.vectorizer import Vectorizer, VectorizerNotFound
-from src.models import AdminUser, Material, MaterialRating, MaterialStatus, MaterialVector, User, UserMaterial
-from src.material.tasks import synchronize_documents_tasks
+from src.libs.exceptions import BadRequestError, ServiceError
+from src.material.schemas import (
+    AdminDashboardDetails,
+    AdminMaterialRow,
+    ChunkedUpload,
+    ChunkedUploadForm,
+    MaterailRecommendation,
+    MaterialCard,
+    Page,
+    TrainingProgress,
+)
+from src.material.tfid.index import search_index, tombstone_on_commit
+from src.material.tfid.vectorizer import VectorizerNotFound
+from src.models import AdminUser, Material, MaterialRating, MaterialStatus, User, UserMaterial
+from src.material.cache import (
+    cache_dashboard_details,
+    get_cached_dashboard_details,
+    invalidate_dashboard_details,
+)
+from src.material.ratings import (
+    RATING_STREAM_SCHEDULED_KEY,
+    apply_material_rating,
+    get_pending_rating,
+    queue_material_rating,
+)
+from src.material.training import get_training_progress, schedule_training
+from src.material.tasks import (
+    apply_queued_ratings,
+    generate_cover_thumbnails,
+    synchronize_documents_tasks,
+)
+from sqlalchemy import JSON, Row, String, case, tuple_, type_coerce, union_all
 from sqlalchemy.exc import SQLAlchemyError
 from src.libs.log import logger
+from src.libs.storage import (
+    delete_stored_file,
+    delete_upload_parts,
+    iter_file_chunks,
+    iter_upload_parts,
+    load_stored_file,
+    store_upload_part,
+    stream_to_storage,
+    stream_upload_to_storage,
+)
 from sqlalchemy_file.exceptions import ContentTypeValidationError, SizeValidationError
+from sqlalchemy_file.helpers import convert_size
 from src.core.config import settings
 
 
+def _chunked_upload_key(upload_id: UUID4) -> str:
+    return f'upload:{upload_id}'
+
+
+def _get_chunked_upload(upload_id: UUID4, owner: AdminUser | User) -> ChunkedUpload:
+    """Load a chunked upload owned by the given user."""
+
+    key = _chunked_upload_key(upload_id)
+    data = redis_client.json().get(key)
+    if not data or data['owner_id'] != str(owner.id):
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Upload not found.",
+        )
+
+    upload = ChunkedUpload.model_validate(data)
+    received_chunks = cast(set[str], redis_client.smembers(f'{key}:chunks'))
+    upload.received_chunks = sorted(int(index) for index in received_chunks)
+    return upload
+
+
+def _clear_chunked_upload(upload: ChunkedUpload) -> None:
+    """Remove the stored parts and state of a chunked upload."""
+
+    delete_upload_parts(str(upload.upload_id), range(upload.total_chunks))
+    key = _chunked_upload_key(upload.upload_id)
+    redis_client.delete(key, f'{key}:chunks')
+
+
+def init_chunked_upload_service(
+    admin_or_user: Annotated[
+        AdminUser | User,
+        Depends(require_admin_or_user_access)
+    ],
+    form_data: Annotated[ChunkedUploadForm, Form()],
+) -> ChunkedUpload:
+    """Start a resumable upload of a material file."""
+
+    if form_data.content_type not in settings.MEDIA_MATERIAL_ALLOWED_CONTENT_TYPES:
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Invalid file type.",
+        )
+
+    if form_data.size > convert_size(settings.MEDIA_FILE_MAX_SIZE):
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="File size too large.",
+        )
+
+    upload = ChunkedUpload(
+        upload_id=uuid.uuid4(),
+        owner_id=admin_or_user.id,
+        filename=form_data.filename,
+        content_type=form_data.content_type,
+        size=form_data.size,
+        chunk_size=settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+        total_chunks=math.ceil(form_data.size / settings.CHUNKED_UPLOAD_CHUNK_SIZE),
+    )
+
+    key = _chunked_upload_key(upload.upload_id)
+    redis_client.json().set(
+        name=key,
+        path=JsonPath.root_path(),
+        obj=upload.model_dump(mode='json', exclude={'received_chunks'}),
+        nx=True,
+    )
+    redis_client.expire(key, settings.CHUNKED_UPLOAD_TTL)
+    return upload
+
+
+def get_chunked_upload_service(
+    admin_or_user: Annotated[
+        AdminUser | User,
+        Depends(require_admin_or_user_access)
+    ],
+    upload_id: Annotated[UUID4, Path()],
+) -> ChunkedUpload:
+    """Get the progress of a chunked upload, used by clients to resume."""
+    return _get_chunked_upload(upload_id, admin_or_user)
+
+
+def append_upload_chunk_service(
+    admin_or_user: Annotated[
+        AdminUser | User,
+        Depends(require_admin_or_user_access)
+    ],
+    upload_id: Annotated[UUID4, Path()],
+    index: Annotated[int, Path(ge=0)],
+    chunk: Annotated[UploadFile, File()],
+) -> ChunkedUpload:
+    """Store a single chunk of an upload."""
+
+    upload = _get_chunked_upload(upload_id, admin_or_user)
+    if upload.completed or index >= upload.total_chunks:
+        raise BadRequestError(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid upload chunk.",
+        )
+
+    expected_size = (
+        upload.chunk_size
+        if index < upload.total_chunks - 1 else
+        upload.size - upload.chunk_size * (upload.total_chunks - 1)
+    )
+    chunk.file.seek(0)
+    size = store_upload_part(
+        str(upload.upload_id), index, iter_file_chunks(chunk.file),
+    )
+    key = _chunked_upload_key(upload.upload_id)
+    if size != expected_size:
+        delete_upload_parts(str(upload.upload_id), [index])
+        redis_client.srem(f'{key}:chunks', index)
+        raise BadRequestError(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid upload chunk size.",
+        )
+
+    redis_client.sadd(f'{key}:chunks', index)
+    redis_client.expire(f'{key}:chunks', settings.CHUNKED_UPLOAD_TTL)
+    redis_client.expire(key, settings.CHUNKED_UPLOAD_TTL)
+
+    upload.received_chunks = sorted({*upload.received_chunks, index})
+    return upload
+
+
+def complete_chunked_upload_service(
+    admin_or_user: Annotated[
+        AdminUser | User,
+        Depends(require_admin_or_user_access)
+    ],
+    upload_id: Annotated[UUID4, Path()],
+) -> ChunkedUpload:
+    """Assemble the uploaded chunks into the final material file."""
+
+    upload = _get_chunked_upload(upload_id, admin_or_user)
+    if upload.completed:
+        return upload
+
+    if len(upload.received_chunks) != upload.total_chunks:
+        raise BadRequestError(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload is missing chunks.",
+        )
+
+    try:
+        file = stream_to_storage(
+            chunks=iter_upload_parts(str(upload.upload_id), upload.total_chunks),
+            filename=upload.filename,
+            content_type=upload.content_type,
+            allowed_content_types=settings.MEDIA_MATERIAL_ALLOWED_CONTENT_TYPES,
+            attr_key='content',
+        )
+    except SizeValidationError as error:
+        _clear_chunked_upload(upload)
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="File size too large.",
+        ) from error
+    except ContentTypeValidationError as error:
+        _clear_chunked_upload(upload)
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Invalid file type.",
+        ) from error
+
+    # the parts are no longer needed once the file has been assembled
+    delete_upload_parts(str(upload.upload_id), range(upload.total_chunks))
+
+    key = _chunked_upload_key(upload.upload_id)
+    redis_client.json().set(key, JsonPath('.file'), dict(file))
+    redis_client.json().set(key, JsonPath('.completed'), True)
+
+    upload.file = dict(file)
+    upload.completed = True
+    return upload
+
+
+def abort_chunked_upload_service(
+    admin_or_user: Annotated[
+        AdminUser | User,
+        Depends(require_admin_or_user_access)
+    ],
+    upload_id: Annotated[UUID4, Path()],
+) -> None:
+    """Discard a chunked upload."""
+
+    upload = _get_chunked_upload(upload_id, admin_or_user)
+    if upload.file:
+        delete_stored_file(load_stored_file(upload.file))
+
+    _clear_chunked_upload(upload)
+
+
 def create_material_service(
     session: Annotated[Session, Depends(require_db_session)],
     admin_or_user: Annotated[
@@ -29,30 +269,78 @@ def create_material_service(
     title: Annotated[str, Form()],
     description: Annotated[str, Form()],
     author: Annotated[str, Form()],
-    content: Annotated[UploadFile, File()],
+    content: Annotated[UploadFile | None, File()] = None,
+    content_upload_id: Annotated[UUID4 | None, Form()] = None,
     cover_image: Annotated[UploadFile | None, File()] = None,
     external_download_url: Annotated[AnyUrl | None, Form()] = None,
 ) -> Material:
     """Create a new material."""
 
+    # material content is either sent with the form or has been
+    # uploaded in chunks beforehand.
+    chunked_upload = None
+    if content_upload_id:
+        chunked_upload = _get_chunked_upload(content_upload_id, admin_or_user)
+        if not chunked_upload.completed:
+            raise ServiceError(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Material upload has not been completed.",
+            )
+    elif not content:
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Material file is required.",
+        )
+
+    # persist the uploads before touching the database so that the
+    # write transaction below only has to insert the metadata rows.
+    content_file = cover_image_file = None
+    try:
+        if chunked_upload and chunked_upload.file is not None:
+            content_file = load_stored_file(chunked_upload.file)
+        elif content:
+            content_file = stream_upload_to_storage(
+                content,
+                allowed_content_types=settings.MEDIA_MATERIAL_ALLOWED_CONTENT_TYPES,
+                attr_key='content',
+            )
+        if cover_image:
+            cover_image_file = stream_upload_to_storage(
+                cover_image,
+                allowed_content_types=settings.MEDIA_IMAGE_ALLOWED_CONTENT_TYPES,
+                attr_key='cover_image',
+            )
+    except SizeValidationError as error:
+        if not chunked_upload:
+            delete_stored_file(content_file)
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="File size too large.",
+        ) from error
+    except ContentTypeValidationError as error:
+        if not chunked_upload:
+            delete_stored_file(content_file)
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Invalid file type.",
+        ) from error
+
     try:
-        vector = MaterialVector()
         material = Material(
             title=title, 
             description=description,
             authors=author,
-            content=content,
-            cover_image=cover_image,
+            content=content_file,
+            cover_image=cover_image_file,
             external_download_url=str(external_download_url) if external_download_url else None,
             status=(
                 MaterialStatus.pending_vectorization 
                 if isinstance(admin_or_user, AdminUser) else
                 MaterialStatus.pending_approval 
             ),
-            vector=vector,
         )
 
-        to_create = [vector, material]
+        to_create: list[Material | UserMaterial] = [material]
 
         # if material is created by user, create recommendation model
         if isinstance(admin_or_user, User):
@@ -65,25 +353,23 @@ def create_material_service(
         session.add_all(to_create)
         session.commit()
         session.refresh(material)
+        invalidate_dashboard_details()
     except SQLAlchemyError as error:
         session.rollback()
-        logger.error(f"Error resetting password: {error}")
+        delete_stored_file(content_file)
+        delete_stored_file(cover_image_file)
+        if chunked_upload:
+            _clear_chunked_upload(chunked_upload)
+        logger.error(f"Error creating material: {error}")
         raise ServiceError(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while submitting material.",
         ) from error
-    except SizeValidationError as error:
-        session.rollback()
-        raise ServiceError(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="File size too large.",
-        ) from error
-    except ContentTypeValidationError as error:
-        session.rollback()
-        raise ServiceError(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Invalid file type.",
-        ) from error
+
+    if chunked_upload:
+        _clear_chunked_upload(chunked_upload)
+    if cover_image_file:
+        generate_cover_thumbnails.delay(material_id=material.id)
 
     return material
 
@@ -95,13 +381,28 @@ def synchronize_service(
     """Revectorize all materials."""
 
     # ensure that we cant trigger synchronization while service is already running
-    if not CeleryHelper.is_being_executed('synchronize_documents_tasks'):
-        synchronize_documents_tasks.apply_async()
-    else:
+    try:
+        scheduled = schedule_training()
+    except RedisError as error:
+        logger.error(f"Error scheduling synchronization: {error}")
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error: Vectors could not be synchronized, please try again.",
+        ) from error
+
+    if not scheduled:
         raise ServiceError(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error: Vectocrs are already being sychronized please be patient.",
         )
+    synchronize_documents_tasks.apply_async()
+
+
+def training_progress_service(
+    admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+) -> TrainingProgress | None:
+    """Get the progress of the running or last synchronization."""
+    return get_training_progress()
 
 
 def _get_combined_score(
@@ -116,36 +417,161 @@ def _get_combined_score(
     ]
 
 
+def _select_material_cards():
+    """
+    Select the catalog fields of materials.
+
+    File columns are never loaded as `File` objects, only the cover image
+    id is extracted and the thumbnails are decoded as plain json.
+    """
+    return select(
+        Material.id,
+        Material.title,
+        Material.authors,
+        Material.average_rating,
+        type_coerce(Material.cover_image, JSON)["file_id"].as_string().label("cover_image_id"),
+        type_coerce(Material.cover_thumbnails, JSON).label("cover_thumbnails"),
+    )
+
+
+def _select_admin_material_rows():
+    """Select the admin table fields of materials without loading file columns."""
+    return select(
+        Material.id,
+        Material.title,
+        Material.status,
+        type_coerce(Material.content, JSON)["size"].as_integer().label("content_size"),
+        Material.created_datetime,
+    )
+
+
+def _encode_page_cursor(created_datetime: datetime | str, material_id: uuid.UUID) -> str:
+    if isinstance(created_datetime, datetime):
+        created_datetime = created_datetime.isoformat()
+    return urlsafe_b64encode(f"{created_datetime}|{material_id}".encode()).decode()
+
+
+def _decode_page_cursor(
+    cursor: str, datetime_as_text: bool,
+) -> tuple[datetime | str, uuid.UUID]:
+    try:
+        created_datetime, material_id = urlsafe_b64decode(cursor).decode().split("|")
+        return (
+            created_datetime if datetime_as_text else datetime.fromisoformat(created_datetime),
+            uuid.UUID(material_id),
+        )
+    except ValueError as error:
+        raise BadRequestError(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid page cursor.",
+        ) from error
+
+
+def _page_statement(
+    session: Session,
+    statement,
+    statuses: list[MaterialStatus],
+    after: str | None,
+    limit: int,
+):
+    """Restrict `statement` to the rows of the page after the cursor."""
+    # sqlite stores datetimes as text in another format than the one python
+    # values are bound in, the cursor keeps and compares the stored text
+    datetime_as_text = session.get_bind().dialect.name == "sqlite"
+    created_datetime = (
+        type_coerce(col(Material.created_datetime), String)
+        if datetime_as_text else
+        col(Material.created_datetime)
+    )
+
+    statement = statement.add_columns(
+        created_datetime.label("cursor_datetime"), col(Material.id).label("cursor_id"),
+    )
+    if after is not None:
+        after_created_datetime, after_id = _decode_page_cursor(after, datetime_as_text)
+        statement = statement.where(
+            tuple_(created_datetime, col(Material.id)) > (after_created_datetime, after_id)
+        )
+
+    # one key ordered range per status, merged in key order
+    pages = union_all(*(
+        statement.where(col(Material.status) == material_status)
+        for material_status in statuses
+    ))
+    return pages.order_by(
+        pages.selected_columns.cursor_datetime, pages.selected_columns.cursor_id,
+    ).limit(limit + 1)
+
+
+def _select_page(
+    session: Session,
+    statement,
+    statuses: list[MaterialStatus],
+    after: str | None,
+    limit: int,
+) -> tuple[Sequence[Row], str | None]:
+    """
+    Fetch one page of materials in `statuses` keyed on (`created_datetime`, `id`).
+
+    The cursor holds the key of the last material of the previous page. Each
+    status is read in key order starting after it, with a range scan of the
+    (status, created_datetime, id) index, and the ranges are merged. A page
+    costs at most `limit` rows per status, however deep into the list it is.
+    """
+    rows = session.execute(
+        _page_statement(session, statement, statuses, after, limit)
+    ).all()
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return rows[:limit], _encode_page_cursor(last.cursor_datetime, last.cursor_id)
+    return rows, None
+
+
+PageCursor = Annotated[str | None, Query()]
+PageLimit = Annotated[int, Query(ge=1, le=100)]
+
+
 def material_search_service(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     admin_or_user: Annotated[
         AdminUser | User,
         Depends(require_admin_or_user_access)
     ],
     search_query: Annotated[str, Query()],
     limit: Annotated[int, Query()] = 10,
-) -> list[Material]:
+) -> Page[MaterialCard]:
     """Perform TFIDF search and reorder results based on combined score."""
     
     try:
-        search_indexes, cosine_similarity = Vectorizer().search(query=search_query, limit=limit)
+        material_ids, cosine_similarity = search_index.search(query=search_query, limit=limit)
     except VectorizerNotFound as error:
         raise ServiceError(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occured during search. Please reach out to admin to re-vectorize",
         ) from error
 
-    if not search_indexes:
-        return []
+    if not material_ids:
+        return Page(items=[])
 
-    # Select vectorized materials
-    materials = session.exec(
-        select(Material).where(
-            Material.status == MaterialStatus.vectorized
-        ).order_by(col(Material.vector_id))
-    ).all()
-    
-    initial_search_results = [materials[index] for index in search_indexes]
+    # Select the matched materials that are still vectorized
+    materials = {
+        row.id: MaterialCard(**row._mapping)
+        for row in session.exec(
+            _select_material_cards().where(
+                col(Material.id).in_(material_ids),
+                Material.status == MaterialStatus.vectorized,
+            )
+        )
+    }
+    matches = [
+        (materials[material_id], similarity)
+        for material_id, similarity in zip(material_ids, cosine_similarity)
+        if material_id in materials
+    ]
+    if not matches:
+        return Page(items=[])
+
+    initial_search_results, cosine_similarity = map(list, zip(*matches))
     normalized_user_ratings = [
         material.normalized_average_rating 
         for material in initial_search_results
@@ -164,30 +590,37 @@ def material_search_service(
     )
 
     search_results = [material for material, _ in sorted_results]
-    return search_results
+    return Page(items=search_results)
 
 
 def admin_material_list_service(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
-) -> list[Material]:
+    after: PageCursor = None,
+    limit: PageLimit = settings.LIST_PAGE_SIZE,
+) -> Page[AdminMaterialRow]:
     """List all materials on the platform."""
     
-    return session.exec(
-        select(Material).where(
-            col(Material.status).in_(
-                [
-                    MaterialStatus.vectorized, 
-                    MaterialStatus.removed,
-                    MaterialStatus.pending_vectorization,
-                ]
-            )
-        ).order_by(col(Material.vector_id))
-    ).all()
+    rows, next_cursor = _select_page(
+        session,
+        _select_admin_material_rows(),
+        statuses=[
+            MaterialStatus.vectorized, 
+            MaterialStatus.removed,
+            MaterialStatus.pending_vectorization,
+        ],
+        after=after,
+        limit=limit,
+    )
+    return Page(
+        items=[AdminMaterialRow(**row._mapping) for row in rows],
+        after=after,
+        next_cursor=next_cursor,
+    )
 
 
 def get_material_service(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     material_id: Annotated[UUID4, Path()],
 ) -> Material:
     """Get a material."""
@@ -210,6 +643,9 @@ def get_material_service(
 
 def check_user_has_rated_material(session: Session, user: User, material: Material) -> bool:
     """Check if user has already rated a material."""
+    if settings.RATING_WRITE_BEHIND and get_pending_rating(material.id, user.id):
+        return True
+
     return bool(
         session.exec(
             select(MaterialRating).where(
@@ -220,78 +656,95 @@ def check_user_has_rated_material(session: Session, user: User, material: Materi
     )
 
 
-def material_user_rating_count(
-    session: Session, material: Material
-) -> int:
+def material_user_rating_count(material: Material) -> int:
     """Return the total number of users who have rated materials."""
-    return session.exec(
-        select(func.count(col(MaterialRating.material_id))).where(
-            MaterialRating.material_id == material.id
+    return material.rating_count
+
+
+RECOMMENDATION_STATUS = {
+    MaterialStatus.pending_approval: 'pending',
+    MaterialStatus.pending_vectorization: 'approved',
+    MaterialStatus.vectorized: 'approved',
+    MaterialStatus.rejected: 'rejected',
+}
+
+
+def _select_recommendations():
+    """Select recommendation rows with their material and recommender in one query."""
+    return select(
+        UserMaterial.material_id,
+        Material.title,
+        Material.status,
+        Material.external_download_url,
+        Material.created_datetime,
+        User.matric_number,
+    ).join(
+        Material, UserMaterial.material_id == Material.id,
+    ).join(
+        User, UserMaterial.user_id == User.id,
+    )
+
+
+def _to_recommendations(rows) -> list[MaterailRecommendation]:
+    return [
+        MaterailRecommendation(
+            status=RECOMMENDATION_STATUS[row.status],
+            material_id=row.material_id,
+            material_title=row.title,
+            recommender_matric_no=str(row.matric_number),
+            recommendation_datetime=row.created_datetime,
+            external_download_link=row.external_download_url,
         )
-    ).first() or 0
+        for row in rows
+    ]
 
 
 def material_recommendation_list_service(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
-) -> list[MaterailRecommendation]:
+    after: PageCursor = None,
+    limit: PageLimit = settings.LIST_PAGE_SIZE,
+) -> Page[MaterailRecommendation]:
     """list recommended materials."""
-    user_recommendations = session.exec(
-        select(UserMaterial).join(
-            Material,
-            UserMaterial.material_id == Material.id,
-        ).where(
-            Material.status == MaterialStatus.pending_approval,
-        )
+    user_recommendations, next_cursor = _select_page(
+        session,
+        _select_recommendations(),
+        statuses=[MaterialStatus.pending_approval],
+        after=after,
+        limit=limit,
     )
 
-    return [
-        MaterailRecommendation(
-            status='pending',
-            material_id=recommendation.material_id,
-            material_title=recommendation.material.title,
-            recommender_matric_no=str(recommendation.user.matric_number),
-            recommendation_datetime=recommendation.material.created_datetime,
-            external_download_link=recommendation.material.external_download_url,
-        )
-        for recommendation in user_recommendations
-    ]
+    return Page(
+        items=_to_recommendations(user_recommendations),
+        after=after,
+        next_cursor=next_cursor,
+    )
 
 
 def user_material_recommendation_list(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     user: Annotated[User, Depends(require_authenticated_user_session)],
-) -> list[MaterailRecommendation]:
+    after: PageCursor = None,
+    limit: PageLimit = settings.LIST_PAGE_SIZE,
+) -> Page[MaterailRecommendation]:
     """List materials recommended by a specific user."""
 
-    user_recommendations = session.exec(
-        select(UserMaterial).join(
-            Material,
-            UserMaterial.material_id == Material.id,
-        ).where(
-            UserMaterial.user_id == user.id,
-            col(Material.status).not_in([MaterialStatus.removed])
-        )
+    user_recommendations, next_cursor = _select_page(
+        session,
+        _select_recommendations().where(UserMaterial.user_id == user.id),
+        statuses=[
+            material_status for material_status in MaterialStatus
+            if material_status != MaterialStatus.removed
+        ],
+        after=after,
+        limit=limit,
     )
 
-    recommendation_status = {
-        MaterialStatus.pending_approval: 'pending',
-        MaterialStatus.pending_vectorization: 'approved',
-        MaterialStatus.vectorized: 'approved',
-        MaterialStatus.rejected: 'rejected',
-    }
-
-    return [
-        MaterailRecommendation(
-            status=recommendation_status[recommendation.material.status],
-            material_id=recommendation.material_id,
-            material_title=recommendation.material.title,
-            recommender_matric_no=str(recommendation.user.matric_number),
-            recommendation_datetime=recommendation.material.created_datetime,
-            external_download_link=recommendation.material.external_download_url,
-        )
-        for recommendation in user_recommendations
-    ]
+    return Page(
+        items=_to_recommendations(user_recommendations),
+        after=after,
+        next_cursor=next_cursor,
+    )
 
 
 def approve_material_recommendation_serivce(
@@ -317,6 +770,7 @@ def approve_material_recommendation_serivce(
     material.status = MaterialStatus.pending_vectorization
     session.add(material)
     session.commit()
+    invalidate_dashboard_details()
     
     return material
 
@@ -344,28 +798,86 @@ def reject_material_recommendation_serivce(
     material.status = MaterialStatus.rejected
     session.add(material)
     session.commit()
+    invalidate_dashboard_details()
 
     return material
 
 
-def _update_material_rating(
+def _transition_materials(
+    session: Session,
+    material_ids: list[UUID4] | None,
+    from_statuses: list[MaterialStatus],
+    to_status: MaterialStatus,
+) -> int:
+    """Move the given materials to a new status with one UPDATE and commit."""
+    if not material_ids:
+        raise ServiceError(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="No materials selected.",
+        )
+
+    transitioned_ids = list(session.execute(
+        update(Material).where(
+            col(Material.id).in_(material_ids),
+            col(Material.status).in_(from_statuses),
+        ).values(status=to_status).returning(col(Material.id))
+    ).scalars())
+    if to_status == MaterialStatus.removed:
+        tombstone_on_commit(session, transitioned_ids)
+    session.commit()
+    invalidate_dashboard_details()
+    return len(transitioned_ids)
+
+
+def bulk_approve_material_recommendation_service(
     session: Annotated[Session, Depends(require_db_session)],
-    material: Annotated[Material, Depends(get_material_service)],    
-) -> Material:
-    """Recalculate a materials rating."""
-    
-    ratings = session.exec(select(MaterialRating).where(
-        MaterialRating.material_id == material.id
-    )).all()
-
-    if ratings:
-        average_rating = sum([rating.rating for rating in ratings]) / len(ratings)
-        material.average_rating = average_rating
-        session.add(material)
-        session.commit()
-        session.refresh(material)
+    admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+    material_ids: Annotated[list[UUID4] | None, Form()] = None,
+) -> int:
+    """Approve many recommended materials, returns how many were approved."""
+    return _transition_materials(
+        session,
+        material_ids=material_ids,
+        from_statuses=[MaterialStatus.pending_approval],
+        to_status=MaterialStatus.pending_vectorization,
+    )
 
-    return material
+
+def bulk_reject_material_recommendation_service(
+    session: Annotated[Session, Depends(require_db_session)],
+    admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+    material_ids: Annotated[list[UUID4] | None, Form()] = None,
+) -> int:
+    """Reject many recommended materials, returns how many were rejected."""
+    return _transition_materials(
+        session,
+        material_ids=material_ids,
+        from_statuses=[MaterialStatus.pending_approval],
+        to_status=MaterialStatus.rejected,
+    )
+
+
+def bulk_mark_materials_for_removal_service(
+    session: Annotated[Session, Depends(require_db_session)],
+    admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+    material_ids: Annotated[list[UUID4] | None, Form()] = None,
+) -> int:
+    """Mark many materials for removal, returns how many were marked."""
+    # unlike a single removal, materials pending vectorization are not
+    # deleted right away, the next synchronization deletes them all.
+    return _transition_materials(
+        session,
+        material_ids=material_ids,
+        from_statuses=[MaterialStatus.vectorized, MaterialStatus.pending_vectorization],
+        to_status=MaterialStatus.removed,
+    )
+
+
+def _schedule_queued_ratings() -> None:
+    """Schedule a consumer run for the queued ratings, at most one at a time."""
+    delay = settings.RATING_WRITE_BEHIND_DELAY
+    if redis_client.set(RATING_STREAM_SCHEDULED_KEY, 1, nx=True, ex=delay * 10):
+        apply_queued_ratings.apply_async(countdown=delay)
 
 
 def rate_material_service(
@@ -376,35 +888,44 @@ def rate_material_service(
 ) -> Material:
     """Rate a material average rating."""
 
-    # check if the user recommmended this material
-    if session.exec(select(UserMaterial).where(
-        UserMaterial.user_id == user.id,
-        UserMaterial.material_id == material.id,
-    )).first():
+    if settings.RATING_WRITE_BEHIND:
+        # check if the user recommmended this material
+        if session.exec(select(UserMaterial).where(
+            UserMaterial.user_id == user.id,
+            UserMaterial.material_id == material.id,
+        )).first():
+            raise ServiceError(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error: You are not allowed to rate a material you recommended.",
+            )
+
+        try:
+            queue_material_rating(material.id, user.id, rating)
+            _schedule_queued_ratings()
+        except RedisError as error:
+            logger.error(f"Error queueing material rating: {error}")
+            raise ServiceError(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occured while rating this material.",
+            ) from error
+
+        # the totals are updated once the consumer applies the vote
+        return material
+
+    if not apply_material_rating(
+        session=session,
+        material_id=material.id,
+        user_id=user.id,
+        rating=rating,
+    ):
         raise ServiceError(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error: You are not allowed to rate a material you recommended.",
         )
-
-    # check if the user has rated this material before
-    material_rating = session.exec(select(MaterialRating).where(
-        MaterialRating.user_id == user.id,
-        MaterialRating.material_id == material.id
-    )).first()
-    
-    if not material_rating:
-        material_rating = MaterialRating(user=user, material=material, rating=rating)
-
-    material_rating.rating = rating
-    session.add(material_rating)
     session.commit()
 
-    material = _update_material_rating(
-        session=session,
-        material=material,
-    )
-
-    return material
+    # `material` belongs to the read only session, load the updated row
+    return session.get_one(Material, material.id)
 
 
 def mark_material_for_removal_service(
@@ -432,78 +953,89 @@ def mark_material_for_removal_service(
             detail="Material not found.",
         )
 
-    if material.status == MaterialStatus.pending_vectorization:
-        # material has not been vectorized we can delete it directly
-        session.delete(material)
-        session.commit()
-    else:
-        material.status = MaterialStatus.removed
-        session.add(material)
-        session.commit()
+    # ratings and recommendations still reference the material, it is deleted
+    # along with them when the next model is published
+    material.status = MaterialStatus.removed
+    session.add(material)
+    session.commit()
+    invalidate_dashboard_details()
 
 
 def get_admin_dashboard_detail_service(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
 ) -> AdminDashboardDetails:
     """Retrieve admin dashboard details."""
-    
-    # count number of users on platform
-    user_count = session.exec(select(func.count(col(User.id)))).first()
-    material_count = session.exec(
-        select(func.count(col(Material.id))).where(
-            Material.status == MaterialStatus.vectorized
-        )
-    ).first()
-    pending_review_count = session.exec(
-        select(func.count(col(Material.id))).where(
-            Material.status == MaterialStatus.pending_approval
-        )        
-    ).first()
-    pending_unvectorization_count = session.exec(
-        select(func.count(col(Material.id))).where(
-            col(Material.status).in_([
-                MaterialStatus.removed,
-                MaterialStatus.pending_vectorization,
-            ])
-        )        
-    ).first()
 
-    return AdminDashboardDetails(
-        user_count=user_count,
-        material_count=material_count,
-        pending_review_count=pending_review_count,
-        pending_unvectorization_count=pending_unvectorization_count,
+    if dashboard_details := get_cached_dashboard_details():
+        return dashboard_details
+
+    def count_status(*statuses: MaterialStatus):
+        return func.count(case((col(Material.status).in_(statuses), 1)))
+
+    # every count in one pass over the material status index
+    counts = session.exec(
+        select(
+            select(func.count(col(User.id))).scalar_subquery(),
+            count_status(MaterialStatus.vectorized),
+            count_status(MaterialStatus.pending_approval),
+            count_status(MaterialStatus.removed, MaterialStatus.pending_vectorization),
+        ).select_from(Material)
+    ).one()
+
+    dashboard_details = AdminDashboardDetails(
+        user_count=counts[0],
+        material_count=counts[1],
+        pending_review_count=counts[2],
+        pending_unvectorization_count=counts[3],
     )
+    cache_dashboard_details(dashboard_details)
+    return dashboard_details
 
 
 def material_pending_vectorization_list_service(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     admin: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
-) -> list[Material]:
+    after: PageCursor = None,
+    limit: PageLimit = settings.LIST_PAGE_SIZE,
+) -> Page[AdminMaterialRow]:
     """List all materials on the platform."""
     
-    return session.exec(
-        select(Material).where(
-            col(Material.status).in_(
-                [
-                    MaterialStatus.removed,
-                    MaterialStatus.pending_vectorization,
-                ]
-            )
-        ).order_by(col(Material.vector_id))
-    ).all()
+    rows, next_cursor = _select_page(
+        session,
+        _select_admin_material_rows(),
+        statuses=[
+            MaterialStatus.removed,
+            MaterialStatus.pending_vectorization,
+        ],
+        after=after,
+        limit=limit,
+    )
+    return Page(
+        items=[AdminMaterialRow(**row._mapping) for row in rows],
+        after=after,
+        next_cursor=next_cursor,
+    )
 
 
 def user_material_list_service(
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     user: Annotated[User, Depends(require_authenticated_user_session)],
-) -> list[Material]:
+    after: PageCursor = None,
+    limit: PageLimit = settings.LIST_PAGE_SIZE,
+) -> Page[MaterialCard]:
     """List all materials on the platform."""
     
-    return session.exec(
-        select(Material).where(
-            Material.status == MaterialStatus.vectorized
-        )
-    ).all()
+    rows, next_cursor = _select_page(
+        session,
+        _select_material_cards(),
+        statuses=[MaterialStatus.vectorized],
+        after=after,
+        limit=limit,
+    )
+    return Page(
+        items=[MaterialCard(**row._mapping) for row in rows],
+        after=after,
+        next_cursor=next_cursor,
+    )
 
@@ -1,15 +1,165 @@
+from uuid import UUID
 from src.worker import celery_app
 from src.core.db import engine
 from sqlmodel import Session
+from redis.exceptions import LockError
+from sqlalchemy.exc import SQLAlchemyError
 from src.material.tfid.train import train_model
 from src.core.config import settings
+from src.core.cache import redis_client
+from src.libs.storage import create_image_thumbnails, delete_stored_file
+from src.material.cache import invalidate_dashboard_details
+from src.material.ratings import (
+    RATING_STREAM_LOCK_KEY,
+    RATING_STREAM_SCHEDULED_KEY,
+    apply_material_rating,
+    dead_letter_queued_rating,
+    forget_queued_ratings,
+    read_queued_ratings,
+    record_queued_rating_failure,
+)
+from src.material.schemas import TrainingProgress, TrainingStage
+from src.material.training import (
+    TRAINING_SCHEDULED_KEY,
+    save_training_progress,
+    training_lock,
+)
+from src.libs.log import logger
+from src.models import Material
 from sqlalchemy_file.storage import StorageManager
 
 
 @celery_app.task(name='synchronize_documents_tasks')
 def synchronize_documents_tasks():
     """Revectorize all materials."""
-    
+
+    with training_lock() as acquired:
+        if not acquired:
+            # the running synchronization stands in for the scheduled one
+            redis_client.delete(TRAINING_SCHEDULED_KEY)
+            logger.info("Vectors are already being synchronized.")
+            return
+        redis_client.delete(TRAINING_SCHEDULED_KEY)
+
+        progress = TrainingProgress(stage="snapshot")
+
+        def report_progress(stage: TrainingStage, processed: int, total: int) -> None:
+            progress.stage, progress.processed, progress.total = stage, processed, total
+            save_training_progress(progress)
+
+        try:
+            train_model(report_progress=report_progress)
+        except Exception:
+            report_progress("failed", progress.processed, progress.total)
+            raise
+        report_progress("finished", progress.total, progress.total)
+    invalidate_dashboard_details()
+
+
+@celery_app.task(name='generate_cover_thumbnails')
+def generate_cover_thumbnails(material_id: UUID) -> None:
+    """Generate the WebP thumbnails of a material cover image."""
+
+    with Session(engine) as session:
+        material = session.get(Material, material_id)
+        if not material or not material.cover_image:
+            return
+
+        thumbnails = create_image_thumbnails(
+            material.cover_image, widths=settings.COVER_THUMBNAIL_WIDTHS,
+        )
+        try:
+            # replaced thumbnails are deleted from storage on commit
+            material.cover_thumbnails = thumbnails
+            session.add(material)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            for thumbnail in thumbnails:
+                delete_stored_file(thumbnail)
+            raise
+
+
+def _apply_ratings(ratings: dict[tuple[UUID, UUID], int]) -> None:
+    """Apply votes in a single transaction."""
     with Session(engine) as session:
-        train_model(db_session=session)
+        for (material_id, user_id), rating in ratings.items():
+            apply_material_rating(
+                session=session,
+                material_id=material_id,
+                user_id=user_id,
+                rating=rating,
+            )
+        session.commit()
+
+
+def _apply_ratings_one_by_one(
+    ratings: dict[tuple[UUID, UUID], int],
+) -> dict[tuple[UUID, UUID], SQLAlchemyError]:
+    """Apply every vote in its own transaction, returns the votes that failed."""
+    failed = {}
+    for key, rating in ratings.items():
+        try:
+            _apply_ratings({key: rating})
+        except SQLAlchemyError as error:
+            failed[key] = error
+    return failed
+
+
+@celery_app.task(name='apply_queued_ratings')
+def apply_queued_ratings() -> None:
+    """Apply the votes queued in write-behind mode in batched transactions."""
+
+    lock = redis_client.lock(RATING_STREAM_LOCK_KEY, timeout=60)
+    if not lock.acquire(blocking=False):
+        # another run is draining the stream, check again once it is done
+        apply_queued_ratings.apply_async(countdown=settings.RATING_WRITE_BEHIND_DELAY)
+        return
+
+    try:
+        # votes queued from now on schedule another run
+        redis_client.delete(RATING_STREAM_SCHEDULED_KEY)
+        while True:
+            entry_ids, ratings = read_queued_ratings(
+                count=settings.RATING_WRITE_BEHIND_BATCH_SIZE,
+            )
+            if not entry_ids:
+                break
+
+            # applying a vote is idempotent, a batch that fails before it
+            # is removed from the stream is applied again on the next run
+            try:
+                _apply_ratings(ratings)
+                failed = {}
+            except SQLAlchemyError as error:
+                logger.error(f"Error applying queued ratings, retrying one by one: {error}")
+                failed = _apply_ratings_one_by_one(ratings)
+
+            forget_queued_ratings(entry_ids, {
+                key: rating for key, rating in ratings.items() if key not in failed
+            })
+
+            retry = False
+            for key, failure in failed.items():
+                if record_queued_rating_failure(key) < settings.RATING_WRITE_BEHIND_MAX_ATTEMPTS:
+                    retry = True
+                    continue
+                logger.error(f"Dropping queued rating {key} after repeated failures: {failure}")
+                dead_letter_queued_rating(key, ratings[key], error=str(failure))
+                forget_queued_ratings(entry_ids, {key: ratings[key]})
 
+            if retry:
+                # the failed votes are at the head of the stream, try them later
+                apply_queued_ratings.apply_async(
+                    countdown=settings.RATING_WRITE_BEHIND_DELAY,
+                )
+                break
+            lock.reacquire()
+    except LockError as error:
+        # the batch outlived the lock, the next run picks up what is left
+        logger.error(f"Rating stream lock lost: {error}")
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            pass
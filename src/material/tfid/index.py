@@ -0,0 +1,166 @@
+import os
+import threading
+from typing import Any, cast
+from uuid import UUID
+
+from redis import Redis
+from redis.client import PubSub, PubSubWorkerThread
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from src.core.cache import redis_client
+from src.libs.log import logger
+from src.material.tfid.vectorizer import (
+    Vectorizer,
+    VectorizerNotFound,
+    get_index_filename,
+)
+from src.models import Material, MaterialStatus
+
+
+class SearchIndex:
+    """
+    The search index loaded once per process.
+
+    Removed materials are tombstoned in the loaded index as soon as the
+    removal is published on redis, they are only dropped from the feature
+    matrix when the index is rebuilt. Tombstones are also kept in a redis
+    set, so an index loaded later starts with every pending removal.
+    """
+
+    channel = "search-index:tombstone"
+    tombstones_key = "search-index:tombstones"
+
+    def __init__(self, redis: Redis) -> None:
+        self._redis = redis
+        self._vectorizer: Vectorizer | None = None
+        self._version: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+        self._listener: PubSubWorkerThread | None = None
+
+    def search(self, query: str, limit: int = 10) -> tuple[list[UUID], list[float]]:
+        """Search the loaded index, see `Vectorizer.search`."""
+        return self._load().search(query=query, limit=limit)
+
+    def tombstone(self, material_ids: list[UUID]) -> None:
+        """Hide removed materials from the search results of every process."""
+        if not material_ids:
+            return
+        self._tombstone(material_ids)
+        try:
+            self._redis.sadd(self.tombstones_key, *map(str, material_ids))
+            self._redis.publish(self.channel, ",".join(map(str, material_ids)))
+        except RedisError as error:
+            logger.error(f"Error publishing search index tombstones: {error}")
+
+    def compact(self, material_ids: list[UUID]) -> None:
+        """
+        Drop the tombstones of materials the rebuilt index does not hold.
+
+        `material_ids` are the documents of the rebuilt index. Materials
+        removed while it was being built are still in it, their tombstones
+        are kept and dropped by the next rebuild instead.
+        """
+        try:
+            tombstones = cast(set[str], self._redis.smembers(self.tombstones_key))
+            stale = tombstones - set(map(str, material_ids))
+            if stale:
+                self._redis.srem(self.tombstones_key, *stale)
+        except RedisError as error:
+            logger.error(f"Error compacting search index tombstones: {error}")
+
+    def _tombstone(self, material_ids: list[UUID]) -> None:
+        if self._vectorizer is not None:
+            self._vectorizer.tombstone(material_ids)
+
+    def _load(self) -> Vectorizer:
+        """Load the index, again whenever a rebuild replaced it on disk."""
+        try:
+            # a rebuild replaces the index file, it gets a new inode
+            stat = os.stat(get_index_filename())
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError as error:
+            logger.error("Vectorizer not found.")
+            raise VectorizerNotFound from error
+
+        if self._vectorizer is not None and self._version == version:
+            return self._vectorizer
+
+        with self._lock:
+            if self._vectorizer is None or self._version != version:
+                self._ensure_listener()
+                vectorizer = Vectorizer()
+                vectorizer.load()
+                try:
+                    tombstones = cast(
+                        set[str], self._redis.smembers(self.tombstones_key),
+                    )
+                except RedisError as error:
+                    logger.error(f"Error reading search index tombstones: {error}")
+                    tombstones = set()
+                vectorizer.tombstone([UUID(material_id) for material_id in tombstones])
+                self._vectorizer, self._version = vectorizer, version
+        return self._vectorizer
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        self._tombstone([UUID(material_id) for material_id in message["data"].split(",")])
+
+    def _handle_listener_error(
+        self, error: BaseException, pubsub: PubSub, thread: PubSubWorkerThread,
+    ) -> None:
+        # tombstones may have been missed, reload the index on the next search
+        logger.error(f"Search index tombstone listener failed: {error}")
+        thread.stop()
+        pubsub.close()
+        with self._lock:
+            self._listener = None
+            self._vectorizer = None
+
+    def _ensure_listener(self) -> None:
+        """Subscribe to tombstones before the index is loaded."""
+        if self._listener is not None:
+            return
+        try:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._handle_message})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1,
+                daemon=True,
+                exception_handler=self._handle_listener_error,
+            )
+        except RedisError as error:
+            logger.error(f"Error subscribing to search index tombstones: {error}")
+
+
+search_index = SearchIndex(redis=redis_client)
+
+
+REMOVED_MATERIALS_KEY = "removed_material_ids"
+
+
+def tombstone_on_commit(session: Session, material_ids: list[UUID]) -> None:
+    """Tombstone materials once the transaction removing them commits."""
+    session.info.setdefault(REMOVED_MATERIALS_KEY, set()).update(material_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_removed_materials(session: Session, flush_context: Any) -> None:
+    """Track materials whose status was changed to removed."""
+    for instance in session.dirty:
+        if not isinstance(instance, Material):
+            continue
+        history = inspect(instance, raiseerr=True).attrs.status.history
+        if MaterialStatus.removed in history.added:
+            tombstone_on_commit(session, [instance.id])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_removed_materials(session: Session) -> None:
+    if material_ids := session.info.pop(REMOVED_MATERIALS_KEY, None):
+        search_index.tombstone(list(material_ids))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_removed_materials(session: Session) -> None:
+    session.info.pop(REMOVED_MATERIALS_KEY, None)
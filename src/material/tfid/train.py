@@ -1,40 +1,139 @@
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
+from typing import cast
+from uuid import UUID
+from sqlalchemy_file import File
 from sqlmodel import Session, select, col, update, delete
-from src.models import Material, MaterialStatus
+from src.core.config import settings
+from src.core.db import engine
+from src.models import (
+    AdminMaterial, 
+    Material, 
+    MaterialLevel, 
+    MaterialRating, 
+    MaterialStatus, 
+    UserMaterial,
+)
 from src.material.parsers.text import Parser as TextParser
+from src.material.schemas import TrainingStage
+from src.material.tfid.index import search_index
 from src.material.tfid.vectorizer import Vectorizer
 import io
 
 
-def train_model(db_session: Session) -> None:
-    """Vectoriize TFIDF model."""
-    
-    materials = db_session.exec(
-        select(Material).where(
-            col(Material.status).in_([
-                MaterialStatus.pending_vectorization, 
-                MaterialStatus.vectorized
-            ])
-        ).order_by(col(Material.vector_id))
-    ).all()
-    
-    documents = [
-        TextParser(
-            io.BytesIO(material.content.file.read())
-        ).parse() for material in materials
-    ]
-
-    if documents:
-        Vectorizer().train(documents)
-
-        # mark all pending vectorization materials as vectorized
-        db_session.exec(
-            update(Material).where(
-                col(Material.status) == MaterialStatus.pending_vectorization
-            ).values(status=MaterialStatus.vectorized)
+PUBLISH_BATCH_SIZE = 500
+
+
+def parse_material(content: File) -> str:
+    """Read and parse the content of a material."""
+    return TextParser(io.BytesIO(content.file.read())).parse()
+
+
+def snapshot_materials() -> list[tuple[UUID, File]]:
+    """
+    Read the id and content of every material to vectorize.
+
+    Only the file metadata is loaded, in one short read transaction. Rows
+    are fetched `TRAIN_BATCH_SIZE` at a time instead of as ORM objects.
+    """
+    with Session(engine) as db_session:
+        rows = db_session.exec(
+            select(Material.id, Material.content).where(
+                col(Material.status).in_([
+                    MaterialStatus.pending_vectorization, 
+                    MaterialStatus.vectorized
+                ])
+            ).order_by(
+                col(Material.created_datetime), col(Material.id)
+            ).execution_options(yield_per=settings.TRAIN_BATCH_SIZE)
         )
+        return [(material_id, cast(File, content)) for material_id, content in rows]
+
+
+def iter_documents(
+    materials: list[tuple[UUID, File]],
+) -> Iterator[tuple[UUID, str]]:
+    """
+    Read and parse the snapshot materials, yield their text in order.
+
+    Materials are parsed `TRAIN_BATCH_SIZE` at a time in a thread pool, the
+    next batch is submitted while the previous one is being consumed. At
+    most two batches of files are held in memory.
+    """
+    with ThreadPoolExecutor(max_workers=settings.TRAIN_PARSER_WORKERS) as executor:
+        parsing: list = []
+        for batch in batched(materials, settings.TRAIN_BATCH_SIZE):
+            submitted = [
+                (material_id, executor.submit(parse_material, content))
+                for material_id, content in batch
+            ]
+            for material_id, document in parsing:
+                yield material_id, document.result()
+            parsing = submitted
+        for material_id, document in parsing:
+            yield material_id, document.result()
+
+
+def publish_model(material_ids: list[UUID]) -> None:
+    """
+    Mark the indexed materials as vectorized and delete removed materials.
+
+    Only materials included in the built index are marked, materials
+    approved while the model was being trained wait for the next run.
+    """
+    with Session(engine) as db_session:
+        for batch in batched(material_ids, PUBLISH_BATCH_SIZE):
+            db_session.execute(
+                update(Material).where(
+                    col(Material.id).in_(batch),
+                    col(Material.status) == MaterialStatus.pending_vectorization,
+                ).values(status=MaterialStatus.vectorized)
+            )
+
+        # delete all material marked for deletion, rows referencing them first
+        # as foreign keys are enforced on postgresql
+        removed_material_ids = db_session.exec(
+            select(Material.id).where(col(Material.status) == MaterialStatus.removed)
+        ).all()
+        for batch in batched(removed_material_ids, PUBLISH_BATCH_SIZE):
+            for model in (MaterialRating, UserMaterial, AdminMaterial, MaterialLevel):
+                db_session.execute(
+                    delete(model).where(col(model.material_id).in_(batch))
+                )
+            db_session.execute(delete(Material).where(col(Material.id).in_(batch)))
+        db_session.commit()
+
+
+def train_model(
+    report_progress: Callable[[TrainingStage, int, int], None] | None = None,
+) -> None:
+    """
+    Vectoriize TFIDF model.
+
+    No transaction is held while the files are parsed and the model is
+    fitted, the database is only used to take a snapshot of the materials
+    and to publish the result. `report_progress` is called with the stage,
+    the number of materials parsed and the total after every batch.
+    """
+    report_progress = report_progress or (lambda stage, processed, total: None)
+
+    report_progress("snapshot", 0, 0)
+    materials = snapshot_materials()
+    total = len(materials)
+
+    def track_documents() -> Iterator[tuple[UUID, str]]:
+        for processed, document in enumerate(iter_documents(materials), start=1):
+            yield document
+            if processed % settings.TRAIN_BATCH_SIZE == 0 or processed == total:
+                report_progress("parsing", processed, total)
+
+    if materials:
+        report_progress("parsing", 0, total)
+        Vectorizer().train(track_documents())
 
-    # delete all material marked for deletion 
-    db_session.exec(
-        delete(Material).where(Material.status == MaterialStatus.removed)
-    )
-    db_session.commit()
+    report_progress("publishing", total, total)
+    material_ids = [material_id for material_id, _ in materials]
+    publish_model(material_ids)
+    if materials:
+        search_index.compact(material_ids)
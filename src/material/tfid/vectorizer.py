@@ -1,6 +1,11 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
 from functools import cached_property
 import os
+import tempfile
+import threading
 from typing import Any
+from uuid import UUID
 import spacy
 import numpy as np
 from numpy.typing import NDArray
@@ -12,10 +17,53 @@ import joblib
 from src.libs.log import logger
 
 
+_tokenizer_lock = threading.Lock()
+
+
 class VectorizerNotFound(Exception):
     """Raised when the vectorizer not found is disk."""
 
 
+@dataclass
+class DocumentIds:
+    """
+    Maps the rows of the feature matrix to materials.
+
+    The row of a document is its internal doc id, ids are only reassigned
+    when the index is rebuilt. Removed documents are tombstoned until then.
+    """
+    material_ids: list[UUID]
+    tombstones: NDArray[np.bool_]
+
+    @classmethod
+    def build(cls, material_ids: list[UUID]) -> "DocumentIds":
+        return cls(
+            material_ids=list(material_ids),
+            tombstones=np.zeros(len(material_ids), dtype=bool),
+        )
+
+    @cached_property
+    def rows(self) -> dict[UUID, int]:
+        return {material_id: row for row, material_id in enumerate(self.material_ids)}
+
+    def tombstone(self, material_ids: list[UUID]) -> None:
+        """Mark the rows of removed materials, unknown materials are ignored."""
+        rows = [self.rows[material_id] for material_id in material_ids if material_id in self.rows]
+        self.tombstones[rows] = True
+
+
+@dataclass
+class SearchIndexFiles:
+    """Everything the search needs, saved to disk as one file."""
+    vectorizer: TfidfVectorizer
+    features: Any
+    document_ids: DocumentIds
+
+
+def get_index_filename() -> str:
+    return f'{settings.MODEL_DIR}/index.gz'
+
+
 class Vectorizer:
     UNWANTED_PIPES = ["ner", "parser"]
 
@@ -23,7 +71,8 @@ class Vectorizer:
         self.nlp = spacy.load('en_core_web_sm')
 
     def _tokenizer(self, doc) -> list:
-        with self.nlp.disable_pipes(*self.UNWANTED_PIPES):
+        # the pipes are toggled on the shared pipeline, which is not thread safe
+        with _tokenizer_lock, self.nlp.disable_pipes(*self.UNWANTED_PIPES):
             return [
                 t.lemma_ for t in self.nlp(doc) 
                 if not t.is_punct and not t.is_space and t.is_alpha
@@ -34,58 +83,94 @@ class Vectorizer:
             os.makedirs(settings.MODEL_DIR, 0o777, exist_ok=True)
 
     @cached_property
-    def _load_vectorizer(self) -> TfidfVectorizer:
-        """Load vectorizer from disk."""
+    def _load_index(self) -> SearchIndexFiles:
+        """Load the vectorizer, features and doc ids from disk."""
         self._check_model_directory()
-        filename = f'{settings.MODEL_DIR}/vectorizer.gz'
+        filename = get_index_filename()
         if not os.path.isfile(filename):
-            raise FileNotFoundError(f"Vectorizer not found at {filename}")
-        return joblib.load(filename)
-
-    @cached_property
-    def _load_features(self) -> Any:
-        """Load features from disk."""
-        self._check_model_directory()
-        filename = f'{settings.MODEL_DIR}/features.gz'
-        if not os.path.isfile(filename):
-            raise FileNotFoundError(f"Features not found at {filename}")
-        return joblib.load(filename)
-    
-    def _save_vectorizer(self, vectorizer: TfidfVectorizer) -> None:
-        """Save the vectorizer to disk."""
+            raise FileNotFoundError(f"Index not found at {filename}")
+
+        index = joblib.load(filename)
+        if index.features.shape[0] != len(index.document_ids.material_ids):
+            raise ValueError(
+                f"Index at {filename} has {index.features.shape[0]} documents "
+                f"but {len(index.document_ids.material_ids)} doc ids"
+            )
+        return index
+
+    def _save_index(self, index: SearchIndexFiles) -> None:
+        """
+        Save the index to disk.
+
+        The index is written to a temporary file that replaces the saved
+        one at once, a process loading it never reads a partial index.
+        """
         self._check_model_directory()
-        joblib.dump(vectorizer, filename=f'{settings.MODEL_DIR}/vectorizer.gz')
-
-    def _save_features(self, features: Any) -> None:
-        """Save the features to disk."""
-        self._check_model_directory()
-        joblib.dump(features, filename=f'{settings.MODEL_DIR}/features.gz')
+        fd, temporary_filename = tempfile.mkstemp(dir=settings.MODEL_DIR, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(index, filename=temporary_filename)
+            os.replace(temporary_filename, get_index_filename())
+        except BaseException:
+            os.remove(temporary_filename)
+            raise
+
+    def train(self, documents: Iterable[tuple[UUID, str]]) -> TfidfVectorizer:
+        """
+        Fit transform and store the new vectorizer with its doc ids.
+
+        Documents are `(material id, text)` pairs, they are consumed once so
+        they can be streamed.
+        """
+        material_ids: list[UUID] = []
+
+        def read_documents():
+            for material_id, document in documents:
+                material_ids.append(material_id)
+                yield document
 
-    def train(self, documents: list[str]) -> TfidfVectorizer:
-        """Fit transform and store the new vectorizer."""
         vectorizer = TfidfVectorizer(tokenizer=self._tokenizer)
-        features = vectorizer.fit_transform(documents)
-        self._save_vectorizer(vectorizer)
-        self._save_features(features)
+        features = vectorizer.fit_transform(read_documents())
+        self._save_index(SearchIndexFiles(
+            vectorizer=vectorizer,
+            features=features,
+            document_ids=DocumentIds.build(material_ids),
+        ))
         return vectorizer
 
-    def sort_search_result(self, result, limit: int) -> NDArray:
-        """Sort the """
-        kth_largest = (limit + 1) * -1
-        return np.argsort(result)[:kth_largest:-1]
-
-    def search(self, query: str, limit: int = 10) -> tuple[list[int], list[float]]:
-        """Search for similar documents to the given query."""
-
+    def load(self) -> tuple[TfidfVectorizer, Any, DocumentIds]:
+        """Load the vectorizer, features and doc ids from disk."""
         try:
-           vectorizer = self._load_vectorizer
-           features = self._load_features
+            index = self._load_index
         except FileNotFoundError as error:
             logger.error("Vectorizer not found.")
             raise VectorizerNotFound from error
+        except ValueError as error:
+            logger.error(f"Invalid vectorizer index: {error}")
+            raise VectorizerNotFound from error
+        return index.vectorizer, index.features, index.document_ids
+
+    def tombstone(self, material_ids: list[UUID]) -> None:
+        """Hide removed materials until the index is rebuilt."""
+        self._load_index.document_ids.tombstone(material_ids)
+
+    def sort_search_result(self, result, limit: int, tombstones: NDArray[np.bool_]) -> NDArray:
+        """Return the rows of the `limit` best scores, tombstoned rows are masked."""
+        scores = np.where(tombstones, -np.inf, result)
+        limit = min(limit, len(scores) - int(np.count_nonzero(tombstones)))
+        if limit <= 0:
+            return np.array([], dtype=int)
+        top = np.argpartition(scores, -limit)[-limit:]
+        return top[np.argsort(scores[top])[::-1]]
+
+    def search(self, query: str, limit: int = 10) -> tuple[list[UUID], list[float]]:
+        """Search for similar documents, returns the ids of the matching materials."""
+        vectorizer, features, document_ids = self.load()
 
         query_vector = vectorizer.transform([query])
         cosine_similarities = cosine_similarity(features, query_vector).flatten()
-        search_result = self.sort_search_result(cosine_similarities, limit)
+        search_result = self.sort_search_result(
+            cosine_similarities, limit, tombstones=document_ids.tombstones,
+        )
         score = cosine_similarities[search_result]
-        return list(search_result), list(score)
+        return [document_ids.material_ids[row] for row in search_result], list(score)
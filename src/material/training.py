@@ -0,0 +1,106 @@
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import cast
+
+from redis.exceptions import LockError, RedisError
+
+from src.core.cache import redis_client
+from src.core.config import settings
+from src.libs.log import logger
+from src.material.schemas import TrainingProgress
+
+
+# held by the running training task, renewed by a heartbeat until it is done
+TRAINING_LOCK_KEY = "material:training:lock"
+# set when a run is scheduled, cleared once the task holds the lock
+TRAINING_SCHEDULED_KEY = "material:training:scheduled"
+TRAINING_PROGRESS_KEY = "material:training:progress"
+
+
+def schedule_training() -> bool:
+    """Claim the next training run, `False` when one is scheduled or running."""
+    if not redis_client.set(
+        TRAINING_SCHEDULED_KEY, 1, nx=True, ex=settings.TRAINING_SCHEDULE_TIMEOUT,
+    ):
+        return False
+    if redis_client.exists(TRAINING_LOCK_KEY):
+        redis_client.delete(TRAINING_SCHEDULED_KEY)
+        return False
+
+    save_training_progress(TrainingProgress(stage="scheduled"))
+    return True
+
+
+@contextmanager
+def training_lock() -> Iterator[bool]:
+    """
+    Hold the training lock while the block runs, yields whether it was acquired.
+
+    The lock expires after `TRAINING_LOCK_TIMEOUT` seconds, a heartbeat
+    thread renews it so it is only released early if the worker dies.
+    """
+    lock = redis_client.lock(
+        TRAINING_LOCK_KEY, timeout=settings.TRAINING_LOCK_TIMEOUT, thread_local=False,
+    )
+    if not lock.acquire(blocking=False):
+        yield False
+        return
+
+    stopped = threading.Event()
+
+    def heartbeat() -> None:
+        while not stopped.wait(settings.TRAINING_LOCK_TIMEOUT / 3):
+            try:
+                lock.reacquire()
+            except LockError as error:
+                logger.error(f"Training lock lost: {error}")
+                return
+            except RedisError as error:
+                logger.error(f"Error renewing training lock: {error}")
+
+    thread = threading.Thread(target=heartbeat, daemon=True)
+    thread.start()
+    try:
+        yield True
+    finally:
+        stopped.set()
+        thread.join()
+        try:
+            lock.release()
+        except LockError:
+            pass
+
+
+def save_training_progress(progress: TrainingProgress) -> None:
+    """Record the progress of the training run for the admin dashboard."""
+    try:
+        redis_client.set(
+            TRAINING_PROGRESS_KEY,
+            progress.model_dump_json(),
+            ex=settings.TRAINING_PROGRESS_TTL,
+        )
+    except RedisError as error:
+        logger.error(f"Error saving training progress: {error}")
+
+
+def get_training_progress() -> TrainingProgress | None:
+    """
+    Return the progress of the running or last training run.
+
+    A run that is neither scheduled nor holding the lock anymore died
+    without recording its end, it is reported as failed.
+    """
+    try:
+        data = cast(str | None, redis_client.get(TRAINING_PROGRESS_KEY))
+        if not data:
+            return None
+        progress = TrainingProgress.model_validate_json(data)
+        if progress.is_running and not redis_client.exists(
+            TRAINING_LOCK_KEY, TRAINING_SCHEDULED_KEY,
+        ):
+            progress.stage = "failed"
+    except RedisError as error:
+        logger.error(f"Error reading training progress: {error}")
+        return None
+    return progress
@@ -1,61 +1,219 @@
-from logging import getLogger
-from typing import Annotated, Any
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, HTTPException
+from fastapi import APIRouter, Path, HTTPException, Request, Response, status
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from fastapi.responses import (
     FileResponse,
     RedirectResponse,
+    StreamingResponse,
 )
+from libcloud.storage.base import Object
 from libcloud.storage.drivers.local import LocalStorageDriver
 from libcloud.storage.types import ObjectDoesNotExistError
 from sqlalchemy_file.storage import StorageManager
 from src.core.config import settings
-from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy_file.stored_file import StoredFile
 
 router = APIRouter()
 
+# Media ids are never reused, the content behind an id can not change.
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MEDIA_METADATA_CACHE_SIZE = 1024
+MEDIA_STREAM_CHUNK_SIZE = 64 * 1024  # 64kb
 
 
-def serve_local_file(file: StoredFile) -> FileResponse:
-    """Handle local file serving"""
+@dataclass(frozen=True)
+class MediaFile:
+    """Resolved metadata of a stored media file"""
+    object: Object
+    filename: str
+    content_type: str
+    size: int
+    cdn_url: str | None
+    is_local: bool
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+_media_files: OrderedDict[UUID, MediaFile] = OrderedDict()
+
+
+def get_file_etag(file: StoredFile) -> str:
+    """Strong ETag from the stored content hash"""
+    checksum = file.object.meta_data.get("sha256") or file.object.hash
+    return f'"{checksum}"'
+
+
+def get_file_last_modified(file: StoredFile) -> str | None:
+    """Last-Modified header value of the stored object"""
+    modify_time = file.object.extra.get("modify_time")
+    if modify_time is not None:
+        return formatdate(int(modify_time), usegmt=True)
+    return file.object.extra.get("last_modified")
+
+
+def get_cache_headers(file: StoredFile) -> dict[str, str]:
+    headers = {"etag": get_file_etag(file), "cache-control": MEDIA_CACHE_CONTROL}
+    if last_modified := get_file_last_modified(file):
+        headers["last-modified"] = last_modified
+    return headers
+
+
+def resolve_media_file(id: UUID) -> MediaFile:
+    """Look up the stored object and its metadata, this blocks on storage IO"""
+    file = StorageManager.get_file(f"{settings.FILE_STORAGE_CONTAINER_NAME}/{id}")
+    return MediaFile(
+        object=file.object,
+        filename=file.filename,
+        content_type=file.content_type,
+        size=file.object.size,
+        cdn_url=file.get_cdn_url(),
+        is_local=isinstance(file.object.driver, LocalStorageDriver),
+        headers=get_cache_headers(file),
+    )
+
+
+async def get_media_file(id: UUID) -> MediaFile:
+    """Resolve media metadata once and keep it in a bounded LRU cache"""
+    if (media_file := _media_files.get(id)) is not None:
+        _media_files.move_to_end(id)
+        return media_file
+
+    media_file = await run_in_threadpool(resolve_media_file, id)
+    _media_files[id] = media_file
+    if len(_media_files) > MEDIA_METADATA_CACHE_SIZE:
+        _media_files.popitem(last=False)
+    return media_file
+
+
+def forget_media_file(id: UUID) -> None:
+    _media_files.pop(id, None)
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the file validators"""
+    if if_none_match := request.headers.get("if-none-match"):
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or headers["etag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("last-modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+                if_modified_since
+            )
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def parse_range_header(
+    request: Request, headers: dict[str, str], size: int,
+) -> tuple[int, int] | None:
+    """Return the inclusive byte range requested, only single ranges are honoured"""
+    range_header = request.headers.get("range", "")
+    if not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    if_range = request.headers.get("if-range")
+    if if_range and if_range not in (headers["etag"], headers.get("last-modified")):
+        return None
+
+    range_start, _, range_end = range_header.removeprefix("bytes=").strip().partition("-")
+    try:
+        if not range_start:
+            # suffix range, the last `range_end` bytes of the file
+            start, end = max(size - int(range_end), 0), size - 1
+        else:
+            start = int(range_start)
+            end = min(int(range_end), size - 1) if range_end else size - 1
+    except ValueError:
+        return None
+
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"content-range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def serve_local_file(file: MediaFile) -> FileResponse:
+    """Handle local file serving, range requests are handled by `FileResponse`"""
+    path = file.cdn_url or ""
     return FileResponse(
-        path=file.get_cdn_url() or "",
+        path=path,
         media_type=file.content_type,
         filename=file.filename,
+        headers=file.headers,
+        stat_result=await run_in_threadpool(os.stat, path),
     )
 
 
-def serve_streaming_file(file: StoredFile) -> StreamingResponse:
+def serve_streaming_file(request: Request, file: MediaFile) -> StreamingResponse:
     """Handle streaming file serving"""
+    headers = {
+        **file.headers,
+        "accept-ranges": "bytes",
+        "Content-Disposition": f"attachment;filename={file.filename}",
+    }
+
+    byte_range = parse_range_header(request, headers, file.size)
+    if byte_range is None:
+        headers["content-length"] = str(file.size)
+        stream = file.object.as_stream(chunk_size=MEDIA_STREAM_CHUNK_SIZE)
+        status_code = status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        headers["content-range"] = f"bytes {start}-{end}/{file.size}"
+        headers["content-length"] = str(end - start + 1)
+        stream = file.object.range_as_stream(
+            start, end + 1, chunk_size=MEDIA_STREAM_CHUNK_SIZE
+        )
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+
+    # chunks are pulled from the storage driver one at a time in the
+    # threadpool, so at most one chunk per download is buffered.
     return StreamingResponse(
-        file.object.as_stream(),
+        iterate_in_threadpool(stream),
+        status_code=status_code,
         media_type=file.content_type,
-        headers={"Content-Disposition": f"attachment;filename={file.filename}"},
+        headers=headers,
     )
 
 
 @router.get("/media/{id}", response_class=FileResponse)
-def serve_media_files(id: UUID = Path(..., description="Unique identifier of the media file"),) -> Any:
+async def serve_media_files(
+    request: Request,
+    id: UUID = Path(..., description="Unique identifier of the media file"),
+) -> Any:
     """Serve media files"""
 
     try:
-        storage_path = (
-            f"{settings.FILE_STORAGE_CONTAINER_NAME}/{id}"
-        )
-        file = StorageManager.get_file(storage_path)
-        file_url = file.get_cdn_url()
+        file = await get_media_file(id)
 
-        if file_url and isinstance(file.object.driver, LocalStorageDriver):
-            # The file is stored on local storage; serve it directly from disk.
-            return serve_local_file(file)
-        elif file_url:
+        if file.cdn_url and not file.is_local:
             # The file has a public URL and is not stored locally, so we redirect.
-            return RedirectResponse(file_url)
+            return RedirectResponse(file.cdn_url)
+
+        if is_not_modified(request, file.headers):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=file.headers
+            )
+
+        if file.cdn_url:
+            # The file is stored on local storage; serve it directly from disk.
+            return await serve_local_file(file)
 
         # No public URL, and the file is not in local storage; stream the file
-        return serve_streaming_file(file)
+        return serve_streaming_file(request, file)
 
-    except ObjectDoesNotExistError as error:
-        raise HTTPException(status_code=404, detail='Not Found') from error
\ No newline at end of file
+    except (ObjectDoesNotExistError, FileNotFoundError) as error:
+        # the file may have been deleted since its metadata was cached
+        forget_media_file(id)
+        raise HTTPException(status_code=404, detail='Not Found') from error
@@ -2,12 +2,14 @@ from datetime import datetime
 from functools import cached_property
 from sqlmodel import SQLModel, Field, Column, DateTime, Session, func, Relationship, col, select
 from pydantic import EmailStr, PositiveInt, FileUrl
+from sqlalchemy import Index
 import uuid
 from src.core.db import engine
 from enum import StrEnum
 from sqlalchemy_file import File, FileField, ImageField
 from sqlalchemy_file.validators import ContentTypeValidator, SizeValidator
 from src.core.config import settings
+from src.libs.storage import build_srcset
 
 
 class User(SQLModel, table=True):
@@ -72,7 +74,7 @@ class MaterialLabels(SQLModel, table=True):
 
 class MaterialRating(SQLModel, table=True):
     user_id: uuid.UUID = Field(foreign_key='user.id', primary_key=True)
-    material_id: uuid.UUID = Field(foreign_key='material.id', primary_key=True)
+    material_id: uuid.UUID = Field(foreign_key='material.id', primary_key=True, index=True)
     rating: int = Field(ge=1, le=5)
     material: "Material" = Relationship(sa_relationship_kwargs={"lazy": "select"})
     user: "User" = Relationship(sa_relationship_kwargs={"lazy": "select"})
@@ -81,7 +83,7 @@ class MaterialRating(SQLModel, table=True):
 class UserMaterial(SQLModel, table=True):
     """Model is a dervied model used to represent materials. created by users."""
     user_id: uuid.UUID = Field(foreign_key='user.id' ,primary_key=True)
-    material_id: uuid.UUID = Field(foreign_key='material.id', primary_key=True)
+    material_id: uuid.UUID = Field(foreign_key='material.id', primary_key=True, index=True)
     
     material: "Material" = Relationship(sa_relationship_kwargs={"lazy": "select"})
     user: "User" = Relationship(sa_relationship_kwargs={"lazy": "select"})
@@ -104,22 +106,31 @@ class MaterialStatus(StrEnum):
     
 
 class Material(SQLModel, table=True):
+    # list pages filter on status and page through (created_datetime, id)
+    __table_args__ = (
+        Index("ix_material_status_created_datetime", "status", "created_datetime", "id"),
+    )
+
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
-    vector_id: int = Field(foreign_key='materialvector.id')
-    vector: "MaterialVector" = Relationship(sa_relationship_kwargs={"lazy": "select"})
     title: str
     description: str
     authors: str
     average_rating: float | None = Field(default=None, ge=1, le=5)
+    # running totals of `MaterialRating`, kept in step with every vote
+    rating_sum: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    rating_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     external_download_url: str | None = Field(nullable=True)
     cover_image: File | None = Field(sa_column=Column(ImageField))
+    cover_thumbnails: list[File] | None = Field(
+        default=None, sa_column=Column(FileField(multiple=True))
+    )
     content: File | None = Field(sa_column=Column(FileField(
         validators=[
             SizeValidator(max_size=settings.MEDIA_FILE_MAX_SIZE),
             ContentTypeValidator(settings.MEDIA_MATERIAL_ALLOWED_CONTENT_TYPES),
         ]
     )))
-    status: MaterialStatus = Field(default=MaterialStatus.pending_approval, index=True)
+    status: MaterialStatus = Field(default=MaterialStatus.pending_approval)
     created_datetime: datetime | None = Field(
         default=None,
         sa_column=Column(
@@ -143,9 +154,7 @@ class Material(SQLModel, table=True):
         )
         return (rating - 1) / 4
 
-
-class MaterialVector(SQLModel, table=True):
-    """Model representing a m
-    
-    aterial vector id."""
-    id: int | None = Field(default=None, primary_key=True)
\ No newline at end of file
+    @property
+    def cover_thumbnail_srcset(self) -> str | None:
+        """Responsive `srcset` of the cover image thumbnails."""
+        return build_srcset(self.cover_thumbnails)
@@ -0,0 +1,228 @@
+"""
+Import a back-catalog of material PDFs.
+
+The source is either a directory of PDFs, titled after their file names, or
+a CSV / JSONL manifest with `path`, `title`, `authors`, `description` and
+optional `external_download_url` and `cover_image` columns. Paths in a
+manifest are relative to the manifest.
+
+Files are streamed into storage a batch at a time and each batch is inserted
+in a single transaction. Imported paths are appended to a state file after
+every commit, running the command again resumes after the last batch.
+Entries with invalid files are listed in a skipped file and retried by the
+next run.
+
+    python src/scripts/import_materials.py ./catalog.csv --synchronize
+"""
+import argparse
+import csv
+import json
+import mimetypes
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy_file import File
+from sqlalchemy_file.exceptions import ContentTypeValidationError, SizeValidationError
+from sqlmodel import Session
+
+from src.core.config import settings
+from src.core.db import engine
+from src.libs.log import logger
+from src.libs.storage import delete_stored_file, iter_file_chunks, stream_to_storage
+from src.material.cache import invalidate_dashboard_details
+from src.material.tasks import generate_cover_thumbnails, synchronize_documents_tasks
+from src.models import Material, MaterialStatus
+
+
+@dataclass
+class ImportEntry:
+    path: Path
+    title: str
+    authors: str
+    description: str = ""
+    external_download_url: str | None = None
+    cover_image: Path | None = None
+
+
+@dataclass
+class StoredEntry:
+    entry: ImportEntry
+    content: File
+    cover_image: File | None = None
+
+
+def read_entries(source: Path) -> Iterator[ImportEntry]:
+    """Yield the materials described by a directory or manifest, lazily."""
+    if source.is_dir():
+        for path in sorted(source.rglob("*.pdf")):
+            yield ImportEntry(
+                path=path, title=path.stem.replace("_", " "), authors="Unknown",
+            )
+        return
+
+    with source.open(newline="") as manifest:
+        rows = (
+            csv.DictReader(manifest)
+            if source.suffix == ".csv" else
+            (json.loads(line) for line in manifest if line.strip())
+        )
+        for row in rows:
+            cover_image = row.get("cover_image")
+            yield ImportEntry(
+                path=source.parent / row["path"],
+                title=row["title"],
+                authors=row.get("authors") or "Unknown",
+                description=row.get("description") or "",
+                external_download_url=row.get("external_download_url") or None,
+                cover_image=source.parent / cover_image if cover_image else None,
+            )
+
+
+def _store_file(path: Path, allowed_content_types: list[str], attr_key: str) -> File:
+    with path.open("rb") as file:
+        return stream_to_storage(
+            chunks=iter_file_chunks(file),
+            filename=path.name,
+            content_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            allowed_content_types=allowed_content_types,
+            attr_key=attr_key,
+        )
+
+
+def store_entry(entry: ImportEntry) -> StoredEntry | None:
+    """Stream the files of an entry into storage, invalid files are skipped."""
+    content = None
+    try:
+        content = _store_file(
+            entry.path, settings.MEDIA_MATERIAL_ALLOWED_CONTENT_TYPES, "content",
+        )
+        cover_image = _store_file(
+            entry.cover_image, settings.MEDIA_IMAGE_ALLOWED_CONTENT_TYPES, "cover_image",
+        ) if entry.cover_image else None
+    except (OSError, ContentTypeValidationError, SizeValidationError) as error:
+        delete_stored_file(content)
+        logger.error(f"Skipping {entry.path}: {error}")
+        return None
+    return StoredEntry(entry=entry, content=content, cover_image=cover_image)
+
+
+def import_batch(
+    session: Session, entries: list[ImportEntry], executor: ThreadPoolExecutor,
+) -> tuple[list[ImportEntry], list[UUID]]:
+    """
+    Store the files of a batch in parallel and insert it in one transaction.
+
+    Returns the entries inserted and the ids of the materials with a cover
+    image, entries with invalid files are left out.
+    """
+    stored = [item for item in executor.map(store_entry, entries) if item]
+    materials = [
+        Material(
+            title=item.entry.title,
+            description=item.entry.description,
+            authors=item.entry.authors,
+            content=item.content,
+            cover_image=item.cover_image,
+            external_download_url=item.entry.external_download_url,
+            status=MaterialStatus.pending_vectorization,
+        )
+        for item in stored
+    ]
+
+    cover_material_ids = [material.id for material in materials if material.cover_image]
+    try:
+        session.add_all(materials)
+        session.commit()
+    except SQLAlchemyError:
+        session.rollback()
+        for item in stored:
+            delete_stored_file(item.content)
+            delete_stored_file(item.cover_image)
+        raise
+
+    return [item.entry for item in stored], cover_material_ids
+
+
+def import_materials(
+    source: Path, batch_size: int, workers: int, synchronize: bool,
+) -> tuple[int, int]:
+    """
+    Import every material of the source that was not imported before.
+
+    Returns the number of materials imported and skipped. Skipped entries
+    are listed in a `.import-skipped` file and retried by the next run.
+    """
+    state_path = source.with_name(f"{source.name}.import-state")
+    skipped_path = source.with_name(f"{source.name}.import-skipped")
+    imported = (
+        set(state_path.read_text().splitlines()) if state_path.exists() else set()
+    )
+    entries = (
+        entry for entry in read_entries(source) if str(entry.path) not in imported
+    )
+
+    count = skipped_count = 0
+    with (
+        Session(engine) as session,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+        state_path.open("a") as state,
+        skipped_path.open("w") as skipped,
+    ):
+        while batch := list(islice(entries, batch_size)):
+            inserted, cover_material_ids = import_batch(session, batch, executor)
+            # recorded only once the batch is committed
+            state.writelines(f"{entry.path}\n" for entry in inserted)
+            state.flush()
+            skipped_entries = [entry for entry in batch if entry not in inserted]
+            skipped.writelines(f"{entry.path}\n" for entry in skipped_entries)
+            skipped.flush()
+
+            for material_id in cover_material_ids:
+                generate_cover_thumbnails.delay(material_id=material_id)
+            count += len(inserted)
+            skipped_count += len(skipped_entries)
+            logger.info(f"Imported {count} materials, skipped {skipped_count}")
+
+    if count:
+        invalidate_dashboard_details()
+        if synchronize:
+            synchronize_documents_tasks.delay()
+    return count, skipped_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import material PDFs.")
+    parser.add_argument(
+        "source", type=Path, help="directory of PDFs or a .csv / .jsonl manifest",
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--workers", type=int, default=4, help="files streamed to storage at once",
+    )
+    parser.add_argument(
+        "--synchronize", action="store_true",
+        help="vectorize the imported materials once the import is done",
+    )
+    args = parser.parse_args()
+
+    logger.info(f"Importing materials from {args.source}")
+    count, skipped_count = import_materials(
+        source=args.source,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        synchronize=args.synchronize,
+    )
+    logger.info(f"Import finished, {count} materials imported")
+    if skipped_count:
+        logger.warning(
+            f"{skipped_count} materials skipped, see {args.source.name}.import-skipped"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,18 @@ from src.core.dependecies import (
     require_superuser,
     require_db_session,
 )
-from src.material.schemas import AdminDashboardDetails, MaterailRecommendation
+from src.material.schemas import (
+    AdminDashboardDetails,
+    AdminMaterialRow,
+    MaterailRecommendation,
+    Page,
+    TrainingProgress,
+)
 from src.material.services import (
     approve_material_recommendation_serivce,
+    bulk_approve_material_recommendation_service,
+    bulk_mark_materials_for_removal_service,
+    bulk_reject_material_recommendation_service,
     create_material_service,
     get_admin_dashboard_detail_service, 
     mark_material_for_removal_service, 
@@ -28,9 +37,11 @@ from src.material.services import (
     material_recommendation_list_service,
     reject_material_recommendation_serivce,
     synchronize_service, 
+    training_progress_service,
     user_material_recommendation_list,
 )
 from src.core.jinja2 import render_template
+from src.libs.utils import parse_html_toast_message
 from src.models import AdminUser, Material
 from src.site.routes.schemas import PageVariable
 
@@ -44,9 +55,18 @@ def admin_dashboard(
     response: Response,
     adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
     dashboard_data: Annotated[AdminDashboardDetails, Depends(get_admin_dashboard_detail_service)],
-    materialsPendingVectorization: Annotated[list[Material], Depends(material_pending_vectorization_list_service)],
+    materialsPendingVectorization: Annotated[Page[AdminMaterialRow], Depends(material_pending_vectorization_list_service)],
+    trainingProgress: Annotated[TrainingProgress | None, Depends(training_progress_service)],
 ) -> HTMLResponse:
     """Render the admin dashboard"""
+    if materialsPendingVectorization.after is not None:
+        return render_template(
+            request=request,
+            response=response,
+            template_name="site/pages/admin/fragments/pending_vectorization_rows.html",
+            context={'materialsPendingVectorization': materialsPendingVectorization},
+        )
+
     return render_template(
         request=request,
         response=response,
@@ -55,6 +75,7 @@ def admin_dashboard(
             'user': adminuser,
             'dashboardData': dashboard_data,
             'materialsPendingVectorization': materialsPendingVectorization,
+            'trainingProgress': trainingProgress,
             'pageVariable': PageVariable(active_nav='DASHBOARD')
         },
     )
@@ -68,7 +89,8 @@ def vectorize_materials(
     adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
     _: Annotated[None, Depends(synchronize_service)],
     dashboard_data: Annotated[AdminDashboardDetails, Depends(get_admin_dashboard_detail_service)],
-    materialsPendingVectorization: Annotated[list[Material], Depends(material_pending_vectorization_list_service)],
+    materialsPendingVectorization: Annotated[Page[AdminMaterialRow], Depends(material_pending_vectorization_list_service)],
+    trainingProgress: Annotated[TrainingProgress | None, Depends(training_progress_service)],
 ) -> HTMLResponse:
     """Vectorize material"""
     if is_htmx:
@@ -81,6 +103,7 @@ def vectorize_materials(
                 'user': adminuser,
                 'dashboardData': dashboard_data,
                 'materialsPendingVectorization': materialsPendingVectorization,
+                'trainingProgress': trainingProgress,
                 'pageVariable': PageVariable(active_nav='DASHBOARD')
             },
         )          
@@ -93,11 +116,28 @@ def vectorize_materials(
             'user': adminuser,
             'dashboardData': dashboard_data,
             'materialsPendingVectorization': materialsPendingVectorization,
+            'trainingProgress': trainingProgress,
             'pageVariable': PageVariable(active_nav='DASHBOARD')
         },
     )
 
 
+@router.get('/materials/synchronize/progress/', response_class=HTMLResponse)
+def vectorization_progress(
+    request: Request,
+    response: Response,
+    adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+    trainingProgress: Annotated[TrainingProgress | None, Depends(training_progress_service)],
+) -> HTMLResponse:
+    """Render the progress of the running vectorization, polled by the dashboard."""
+    return render_template(
+        request=request,
+        response=response,
+        template_name="site/pages/admin/fragments/training_progress.html",
+        context={'trainingProgress': trainingProgress},
+    )
+
+
 @router.get(
     "/reset-password/",
     response_class=HTMLResponse,
@@ -207,6 +247,7 @@ def admin_login_form(
             session=session,
             admin=user,
         )
+        trainingProgress = training_progress_service(admin=user)
         return render_template(
             request=request,
             response=response,
@@ -216,6 +257,7 @@ def admin_login_form(
                 'user': user,
                 'dashboardData': dashboard_data,
                 'materialsPendingVectorization': materialsPendingVectorization,
+                'trainingProgress': trainingProgress,
                 'pageVariable': PageVariable(active_nav='DASHBOARD'),
             }
         )
@@ -324,9 +366,17 @@ def admin_materials_list_page(
     request: Request,
     response: Response,
     adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
-    materials:  Annotated[list[Material], Depends(admin_material_list_service)],
+    materials:  Annotated[Page[AdminMaterialRow], Depends(admin_material_list_service)],
 ) -> HTMLResponse:
     """Render the admin material page"""
+    if materials.after is not None:
+        return render_template(
+            request=request,
+            response=response,
+            template_name="site/pages/admin/fragments/material_rows.html",
+            context={'materials': materials},
+        )
+
     return render_template(
         request=request,
         response=response,
@@ -346,7 +396,7 @@ def add_a_material(
     is_htmx: Annotated[bool, Depends(check_htmx_request)],
     user: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
     new_recommendation:  Annotated[Material, Depends(create_material_service)],
-    materials:  Annotated[list[Material], Depends(admin_material_list_service)]
+    materials:  Annotated[Page[AdminMaterialRow], Depends(admin_material_list_service)]
 ) -> HTMLResponse:
     """Add a new material to the system."""
     if is_htmx:
@@ -374,6 +424,31 @@ def add_a_material(
     )
 
 
+@router.post("/materials/bulk/remove", response_class=HTMLResponse)
+def bulk_mark_materials_for_removal(
+    request: Request,
+    response: Response,
+    user: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+    removed_count: Annotated[int, Depends(bulk_mark_materials_for_removal_service)],
+    materials: Annotated[Page[AdminMaterialRow], Depends(admin_material_list_service)],
+) -> HTMLResponse:
+    """Mark the selected materials for removal."""
+    return render_template(
+        request=request,
+        response=response,
+        template_name="site/pages/admin/fragments/bulk_result.html",
+        context={
+            'rows_template': "site/pages/admin/fragments/material_rows.html",
+            'materials': materials,
+            'toast': parse_html_toast_message(
+                error_level='info',
+                message=f"{removed_count} material(s) marked for removal.",
+                title="Materials",
+            ),
+        },
+    )
+
+
 @router.delete("/materials/{material_id}/", response_class=HTMLResponse) 
 def mark_material_for_removal(
     request: Request,
@@ -381,7 +456,7 @@ def mark_material_for_removal(
     is_htmx: Annotated[bool, Depends(check_htmx_request)],
     user: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
     _:  Annotated[Material, Depends(mark_material_for_removal_service)],
-    materials:  Annotated[list[Material], Depends(admin_material_list_service)]
+    materials:  Annotated[Page[AdminMaterialRow], Depends(admin_material_list_service)]
 ) -> HTMLResponse:
     """Mark a material for removal."""
     if is_htmx:
@@ -414,9 +489,17 @@ def list_material_recommendations(
     request: Request,
     response: Response,
     adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
-    recommendations: Annotated[MaterailRecommendation, Depends(material_recommendation_list_service)],
+    recommendations: Annotated[Page[MaterailRecommendation], Depends(material_recommendation_list_service)],
 ) -> HTMLResponse:
     """Render the reccommendation page"""
+    if recommendations.after is not None:
+        return render_template(
+            request=request,
+            response=response,
+            template_name="site/pages/admin/fragments/recommendation_rows.html",
+            context={'recommendations': recommendations},
+        )
+
     return render_template(
         request=request,
         response=response,
@@ -429,6 +512,56 @@ def list_material_recommendations(
     )
 
 
+@router.post("/reccommendation/bulk/accept", response_class=HTMLResponse)
+def bulk_accept_material_recommendations(
+    request: Request,
+    response: Response,
+    adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+    accepted_count: Annotated[int, Depends(bulk_approve_material_recommendation_service)],
+    recommendations: Annotated[Page[MaterailRecommendation], Depends(material_recommendation_list_service)],
+) -> HTMLResponse:
+    """Accept the selected material recommendations."""
+    return render_template(
+        request=request,
+        response=response,
+        template_name="site/pages/admin/fragments/bulk_result.html",
+        context={
+            'rows_template': "site/pages/admin/fragments/recommendation_rows.html",
+            'recommendations': recommendations,
+            'toast': parse_html_toast_message(
+                error_level='info',
+                message=f"{accepted_count} recommendation(s) accepted.",
+                title="Recommendations",
+            ),
+        },
+    )
+
+
+@router.post("/reccommendation/bulk/reject", response_class=HTMLResponse)
+def bulk_reject_material_recommendations(
+    request: Request,
+    response: Response,
+    adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
+    rejected_count: Annotated[int, Depends(bulk_reject_material_recommendation_service)],
+    recommendations: Annotated[Page[MaterailRecommendation], Depends(material_recommendation_list_service)],
+) -> HTMLResponse:
+    """Reject the selected material recommendations."""
+    return render_template(
+        request=request,
+        response=response,
+        template_name="site/pages/admin/fragments/bulk_result.html",
+        context={
+            'rows_template': "site/pages/admin/fragments/recommendation_rows.html",
+            'recommendations': recommendations,
+            'toast': parse_html_toast_message(
+                error_level='info',
+                message=f"{rejected_count} recommendation(s) rejected.",
+                title="Recommendations",
+            ),
+        },
+    )
+
+
 @router.post("/reccommendation/{material_id}/accept", response_class=HTMLResponse)
 def accept_material_recommendation(
     request: Request,
@@ -436,7 +569,7 @@ def accept_material_recommendation(
     is_htmx: Annotated[bool, Depends(check_htmx_request)],
     adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
     accepted_material: Annotated[Material, Depends(approve_material_recommendation_serivce)],
-    recommendations: Annotated[MaterailRecommendation, Depends(material_recommendation_list_service)],
+    recommendations: Annotated[Page[MaterailRecommendation], Depends(material_recommendation_list_service)],
 ) -> HTMLResponse:
     """Accept material recommedation."""
     if is_htmx:
@@ -471,7 +604,7 @@ def accept_material_recommendation(
     is_htmx: Annotated[bool, Depends(check_htmx_request)],
     adminuser: Annotated[AdminUser, Depends(require_authenticated_admin_user_session)],
     rejected_material: Annotated[Material, Depends(reject_material_recommendation_serivce)],
-    recommendations: Annotated[MaterailRecommendation, Depends(material_recommendation_list_service)],
+    recommendations: Annotated[Page[MaterailRecommendation], Depends(material_recommendation_list_service)],
 ) -> HTMLResponse:
     """Accept material recommedation."""
     if is_htmx:
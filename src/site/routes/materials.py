@@ -8,11 +8,12 @@ from src.core.dependecies import (
     push_htmx_history, 
     require_authenticated_user_session,
     require_db_session,
+    require_read_only_db_session,
 )
 from src.core.jinja2 import render_template
 from src.models import Material, User
 from src.site.routes.schemas import PageVariable
-from src.material.schemas import MaterailRecommendation
+from src.material.schemas import MaterailRecommendation, MaterialCard, Page
 from src.material.services import (
     check_user_has_rated_material,
     create_material_service, 
@@ -37,9 +38,18 @@ def cource_materials(
     request: Request,
     response: Response,
     user: Annotated[User, Depends(require_authenticated_user_session)],
-    materials: Annotated[list[Material], Depends(user_material_list_service)],
+    materials: Annotated[Page[MaterialCard], Depends(user_material_list_service)],
 ) -> HTMLResponse:
     """Render list cource materials page."""
+    if materials.after is not None:
+        response.headers["HX-Push-Url"] = "false"
+        return render_template(
+            request=request,
+            response=response,
+            template_name="site/pages/user/fragments/material_cards.html",
+            context={"materials": materials},
+        )
+
     return render_template(
         request=request,
         response=response,
@@ -61,7 +71,7 @@ def cource_materials(
     request: Request,
     response: Response,
     user: Annotated[User, Depends(require_authenticated_user_session)],
-    materials: Annotated[list[Material], Depends(material_search_service)],
+    materials: Annotated[Page[MaterialCard], Depends(material_search_service)],
 ) -> HTMLResponse:
     """Render list cource materials page."""
     return render_template(
@@ -87,9 +97,18 @@ def reccommendations_page(
     response: Response,
     is_htmx: Annotated[bool, Depends(check_htmx_request)],
     user: Annotated[User, Depends(require_authenticated_user_session)],
-    user_recommedations:  Annotated[list[MaterailRecommendation], Depends(user_material_recommendation_list)]
+    user_recommedations:  Annotated[Page[MaterailRecommendation], Depends(user_material_recommendation_list)]
 ) -> HTMLResponse:
     """Render recommendation_history page."""
+    if user_recommedations.after is not None:
+        response.headers["HX-Push-Url"] = "false"
+        return render_template(
+            request=request,
+            response=response,
+            template_name="site/pages/user/fragments/recommendation_rows.html",
+            context={'recommendations': user_recommedations},
+        )
+
     return render_template(
         request=request,
         response=response,
@@ -109,7 +128,7 @@ def create_a_material_recommendation(
     is_htmx: Annotated[bool, Depends(check_htmx_request)],
     user: Annotated[User, Depends(require_authenticated_user_session)],
     new_recommendation:  Annotated[Material, Depends(create_material_service)],
-    user_recommedations:  Annotated[list[MaterailRecommendation], Depends(user_material_recommendation_list)]
+    user_recommedations:  Annotated[Page[MaterailRecommendation], Depends(user_material_recommendation_list)]
 ) -> HTMLResponse:
     """Submit a material recommendation."""
     if is_htmx:
@@ -164,7 +183,7 @@ def rate_materials_page(
 def cource_material_detail_page(
     request: Request,
     response: Response,
-    session: Annotated[Session, Depends(require_db_session)],
+    session: Annotated[Session, Depends(require_read_only_db_session)],
     user: Annotated[User, Depends(require_authenticated_user_session)],
     material: Annotated[Material, Depends(get_material_service)],
 ) -> HTMLResponse:
@@ -179,9 +198,7 @@ def cource_material_detail_page(
             "hasRatedThisMaterial": check_user_has_rated_material(
                 session=session, user=user, material=material,
             ),
-            "materialRatingCount": material_user_rating_count(
-                session=session, material=material,
-            ),
+            "materialRatingCount": material_user_rating_count(material=material),
             "pageVariable": PageVariable(active_nav='DASHBOARD'),
         },
     )
@@ -213,9 +230,7 @@ def rate_cource_material_form(
                 "hasRatedThisMaterial": check_user_has_rated_material(
                     session=session, user=user, material=material,
                 ),
-                "materialRatingCount": material_user_rating_count(
-                    session=session, material=material,
-                ),
+                "materialRatingCount": material_user_rating_count(material=material),
                 "pageVariable": PageVariable(active_nav='DASHBOARD'),
             },
         )
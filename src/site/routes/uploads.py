@@ -0,0 +1,54 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Response, status
+
+from src.material.schemas import ChunkedUpload
+from src.material.services import (
+    abort_chunked_upload_service,
+    append_upload_chunk_service,
+    complete_chunked_upload_service,
+    get_chunked_upload_service,
+    init_chunked_upload_service,
+)
+
+
+router = APIRouter()
+
+
+@router.post("/", response_model=ChunkedUpload)
+def start_chunked_upload(
+    upload: Annotated[ChunkedUpload, Depends(init_chunked_upload_service)],
+) -> ChunkedUpload:
+    """Start a resumable material upload."""
+    return upload
+
+
+@router.get("/{upload_id}/", response_model=ChunkedUpload)
+def chunked_upload_status(
+    upload: Annotated[ChunkedUpload, Depends(get_chunked_upload_service)],
+) -> ChunkedUpload:
+    """Return the chunks received so far."""
+    return upload
+
+
+@router.put("/{upload_id}/chunks/{index}/", response_model=ChunkedUpload)
+def append_upload_chunk(
+    upload: Annotated[ChunkedUpload, Depends(append_upload_chunk_service)],
+) -> ChunkedUpload:
+    """Append a chunk to an upload."""
+    return upload
+
+
+@router.post("/{upload_id}/complete/", response_model=ChunkedUpload)
+def complete_chunked_upload(
+    upload: Annotated[ChunkedUpload, Depends(complete_chunked_upload_service)],
+) -> ChunkedUpload:
+    """Assemble the uploaded chunks."""
+    return upload
+
+
+@router.delete("/{upload_id}/", status_code=status.HTTP_204_NO_CONTENT)
+def abort_chunked_upload(
+    _: Annotated[None, Depends(abort_chunked_upload_service)],
+) -> Response:
+    """Discard an upload."""
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,91 @@
+// Upload large material files in resumable chunks before the form is submitted.
+// Forms opt in with the `data-chunked-upload` attribute and must contain a
+// `content` file input and a disabled hidden `content_upload_id` input.
+const CHUNKED_UPLOAD_THRESHOLD = 5 * 1024 * 1024; // 5mb
+
+function chunkedUploadStorageKey(file) {
+    return `chunked-upload:${file.name}:${file.size}:${file.lastModified}`;
+}
+
+async function chunkedUploadRequest(url, options) {
+    const response = await fetch(url, options);
+    if (!response.ok) {
+        throw new Error(`Upload failed with status ${response.status}`);
+    }
+    return response.status === 204 ? null : response.json();
+}
+
+async function resumeOrStartChunkedUpload(file) {
+    const storageKey = chunkedUploadStorageKey(file);
+    const uploadId = localStorage.getItem(storageKey);
+
+    if (uploadId) {
+        try {
+            return await chunkedUploadRequest(`/uploads/${uploadId}/`, {method: "GET"});
+        } catch (error) {
+            localStorage.removeItem(storageKey);
+        }
+    }
+
+    const form = new FormData();
+    form.append("filename", file.name);
+    form.append("content_type", file.type || "application/octet-stream");
+    form.append("size", file.size);
+
+    const upload = await chunkedUploadRequest("/uploads/", {method: "POST", body: form});
+    localStorage.setItem(storageKey, upload.upload_id);
+    return upload;
+}
+
+async function uploadFileInChunks(file, onProgress) {
+    let upload = await resumeOrStartChunkedUpload(file);
+    const received = new Set(upload.received_chunks);
+
+    for (let index = 0; index < upload.total_chunks; index++) {
+        if (received.has(index)) continue;
+
+        const start = index * upload.chunk_size;
+        const form = new FormData();
+        form.append("chunk", file.slice(start, start + upload.chunk_size), file.name);
+
+        upload = await chunkedUploadRequest(
+            `/uploads/${upload.upload_id}/chunks/${index}/`,
+            {method: "PUT", body: form},
+        );
+        onProgress && onProgress(upload.received_chunks.length / upload.total_chunks);
+    }
+
+    upload = await chunkedUploadRequest(`/uploads/${upload.upload_id}/complete/`, {method: "POST"});
+    localStorage.removeItem(chunkedUploadStorageKey(file));
+    return upload.upload_id;
+}
+
+document.addEventListener("htmx:confirm", function (e) {
+    const form = e.detail.elt;
+    if (!form.hasAttribute || !form.hasAttribute("data-chunked-upload")) return;
+
+    const fileInput = form.querySelector('input[type="file"][name="content"]');
+    const uploadIdInput = form.querySelector('input[name="content_upload_id"]');
+    const file = fileInput && fileInput.files[0];
+    if (!file || file.size <= CHUNKED_UPLOAD_THRESHOLD) return;
+
+    e.preventDefault();
+    const progress = form.querySelector("[data-chunked-upload-progress]");
+
+    uploadFileInChunks(file, (ratio) => {
+        if (progress) progress.innerText = `Uploading... ${Math.round(ratio * 100)}%`;
+    })
+    .then((uploadId) => {
+        uploadIdInput.value = uploadId;
+        uploadIdInput.disabled = false;
+        // the file has already been uploaded, do not send it again with the form
+        fileInput.disabled = true;
+        e.detail.issueRequest(true);
+        fileInput.disabled = false;
+        uploadIdInput.disabled = true;
+        if (progress) progress.innerText = "";
+    })
+    .catch(() => {
+        if (progress) progress.innerText = "Upload interrupted, submit again to resume.";
+    });
+});
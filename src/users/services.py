@@ -2,9 +2,10 @@ from fastapi import Form, Depends, Request, Response, status, Path
 from typing import Annotated
 
 from sqlmodel import Session, select, or_
+from src.core.cache import principal_cache
 from src.core.dependecies import require_db_session, require_authenticated_user_session
 from src.core.security import create_session_token, decrypt_token, get_password_hash, logout_sesssion, verify_password
-from src.core.sessions import cookie as SessionCookie
+from src.core.sessions import PrincipalType, cookie as SessionCookie
 from src.libs.exceptions import ServiceError, BadRequestError
 from src.users.schemas import ChangePasswordForm, LoginForm, PasswordResetForm,  UserSignupForm, ResetPasswordRequestForm
 from src.models import User
@@ -102,7 +103,9 @@ def user_login_service(
             detail="You have not verified your email address. Please check your email for the verification link",
         )
 
-    create_session_token(user_id=user.id, response=response)
+    create_session_token(
+        user_id=user.id, principal_type=PrincipalType.user, response=response
+    )
     return user
 
 
@@ -157,6 +160,7 @@ def reset_password_service(
         user.password = get_password_hash(form_data.password)
         session.add(user)
         session.commit()
+        principal_cache.invalidate(user.id)
     except SQLAlchemyError as error:
         session.rollback()
         logger.error(f"Error resetting password: {error}")
@@ -182,6 +186,7 @@ def change_user_password_service(
     user.password = get_password_hash(form_data.new_password)
     session.add(user)
     session.commit()
+    principal_cache.invalidate(user.id)
     return user
 
     
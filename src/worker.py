@@ -2,7 +2,8 @@ from celery import Celery, Task
 from src.core.config import settings
 from src.libs.log import logger
 from sqlalchemy_file.storage import StorageManager
-from celery.signals import task_postrun, task_prerun
+from celery.signals import task_postrun, task_prerun, worker_process_init
+from src.core.db import engine
 
 celery_app = Celery(__name__, include=["src.worker", "src.users.tasks", "src.admin.tasks", 'src.material.tasks'])
 celery_app.conf.broker_url = settings.CELERY_BROKER_URL
@@ -17,6 +18,12 @@ if settings.file_storage_container:
         pass
 
 
+@worker_process_init.connect
+def _reset_db_connection_pool(**kwargs) -> None:  # type: ignore  # noqa
+    """Do not reuse database connections inherited from the parent process."""
+    engine.dispose(close=False)
+
+
 @task_prerun.connect
 def _log_task_before_run(task_id: str, task: Task, *args, **kwargs) -> None:  # type: ignore  # noqa
     """Log task before it runs."""
@@ -0,0 +1,40 @@
+import os
+import tempfile
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine
+
+# the settings are read when `src` is imported, only defaults are set here
+_test_dir = tempfile.mkdtemp(prefix="material-ranker-")
+for name, value in {
+    "PROJECT_NAME": "material-ranker",
+    "SQLITE_DATABASE_PATH": os.path.join(_test_dir, "db.sqlite3"),
+    "TEST_DATABASE_PATH": os.path.join(_test_dir, "test.sqlite3"),
+    "FIRST_SUPERUSER": "admin",
+    "FIRST_SUPERUSER_PASSWORD": "admin-password",
+    "TEMPLATE_DIR": "src/templates",
+    "STATIC_DIR": "src/static",
+    "MODEL_DIR": os.path.join(_test_dir, "models"),
+}.items():
+    os.environ.setdefault(name, value)
+
+from sqlmodel import Session, SQLModel
+
+import src.models  # noqa: F401
+from src.core.db import create_db_engine
+
+
+@pytest.fixture
+def db_engine(tmp_path) -> Iterator[Engine]:
+    """An engine on an empty sqlite database with every table created."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(db_engine: Engine) -> Iterator[Session]:
+    with Session(db_engine) as session:
+        yield session
@@ -0,0 +1,97 @@
+import pytest
+from sqlmodel import Session
+
+from src.libs.exceptions import BadRequestError
+from src.material.services import (
+    admin_material_list_service,
+    user_material_list_service,
+)
+from src.models import AdminUser, Material, MaterialStatus, User
+
+
+def create_materials(
+    session: Session, count: int, statuses: list[MaterialStatus] | None = None,
+) -> list[Material]:
+    # created in one statement, the materials share their created_datetime
+    statuses = statuses or [MaterialStatus.vectorized]
+    materials = [
+        Material(
+            title=f"Material {index}",
+            description="description",
+            authors="author",
+            status=statuses[index % len(statuses)],
+        )
+        for index in range(count)
+    ]
+    session.add_all(materials)
+    session.commit()
+    return materials
+
+
+def list_materials(session: Session, after: str | None, limit: int):
+    return user_material_list_service(
+        session=session,
+        user=User(fullname="User", matric_number=1, email="user@example.com", password=None),
+        after=after,
+        limit=limit,
+    )
+
+
+def test_pages_cover_every_material_once(session: Session) -> None:
+    material_ids = {material.id for material in create_materials(session, 7)}
+
+    listed_ids, after = [], None
+    while True:
+        page = list_materials(session, after=after, limit=3)
+        listed_ids += [item.id for item in page.items]
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+
+    assert len(listed_ids) == len(material_ids)
+    assert set(listed_ids) == material_ids
+
+
+def test_pages_merge_every_listed_status(session: Session) -> None:
+    materials = create_materials(session, 10, statuses=[
+        MaterialStatus.vectorized,
+        MaterialStatus.removed,
+        MaterialStatus.pending_approval,
+        MaterialStatus.pending_vectorization,
+    ])
+    admin = AdminUser(fullname="Admin", email="admin@example.com", password=None)
+
+    listed_ids, after = [], None
+    while True:
+        page = admin_material_list_service(session=session, admin=admin, after=after, limit=3)
+        listed_ids += [item.id for item in page.items]
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+
+    listed_materials = sorted(
+        (
+            material for material in materials
+            if material.status != MaterialStatus.pending_approval
+        ),
+        key=lambda material: (material.created_datetime, material.id.hex),
+    )
+    assert listed_ids == [material.id for material in listed_materials]
+
+
+def test_page_after_deleted_material(session: Session) -> None:
+    create_materials(session, 5)
+    first_page = list_materials(session, after=None, limit=2)
+    session.delete(session.get_one(Material, first_page.items[-1].id))
+    session.commit()
+
+    page = list_materials(session, after=first_page.next_cursor, limit=2)
+
+    assert len(page.items) == 2
+    assert not {item.id for item in page.items} & {item.id for item in first_page.items}
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "bm90LWEtY3Vyc29y", "MjAyNnxub3QtYW4taWQ="])
+def test_invalid_cursor_is_rejected(session: Session, cursor: str) -> None:
+    with pytest.raises(BadRequestError):
+        list_materials(session, after=cursor, limit=2)
@@ -0,0 +1,51 @@
+from sqlmodel import Session, func, select
+
+from src.material.ratings import apply_material_rating
+from src.models import Material, MaterialRating, User, UserMaterial
+
+
+def create_user(session: Session, index: int) -> User:
+    user = User(
+        fullname=f"User {index}",
+        matric_number=index,
+        email=f"user{index}@example.com",
+        password=None,
+    )
+    session.add(user)
+    session.commit()
+    return user
+
+
+def test_votes_keep_rating_totals(session: Session) -> None:
+    material = Material(title="Material", description="description", authors="author")
+    session.add(material)
+    session.commit()
+    first_user, second_user = create_user(session, 1), create_user(session, 2)
+
+    for user, rating in [(first_user, 4), (first_user, 2), (second_user, 5), (first_user, 3)]:
+        assert apply_material_rating(
+            session=session, material_id=material.id, user_id=user.id, rating=rating,
+        )
+        session.commit()
+
+    session.refresh(material)
+    assert (material.rating_sum, material.rating_count) == (8, 2)
+    assert material.average_rating == 4
+    ratings = session.exec(select(func.sum(MaterialRating.rating), func.count())).one()
+    assert tuple(ratings) == (8, 2)
+
+
+def test_recommended_material_is_not_rated(session: Session) -> None:
+    user = create_user(session, 1)
+    material = Material(title="Material", description="description", authors="author")
+    session.add(UserMaterial(user=user, material=material))
+    session.commit()
+
+    assert not apply_material_rating(
+        session=session, material_id=material.id, user_id=user.id, rating=4,
+    )
+    session.commit()
+
+    session.refresh(material)
+    assert (material.rating_sum, material.rating_count) == (0, 0)
+    assert session.exec(select(MaterialRating)).first() is None
@@ -0,0 +1,94 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import Engine, event
+from sqlmodel import Session
+
+from src.material.services import (
+    material_recommendation_list_service,
+    user_material_recommendation_list,
+)
+from src.models import AdminUser, Material, User, UserMaterial
+
+
+def create_users(session: Session, count: int) -> list[User]:
+    users = [
+        User(
+            fullname=f"User {index}",
+            matric_number=index,
+            email=f"user{index}@example.com",
+            password=None,
+        )
+        for index in range(count)
+    ]
+    session.add_all(users)
+    session.commit()
+    return users
+
+
+def create_recommendations(session: Session, user: User, count: int) -> None:
+    session.add_all(
+        UserMaterial(
+            user=user,
+            material=Material(
+                title=f"Material {index}",
+                description="description",
+                authors="author",
+            ),
+        )
+        for index in range(count)
+    )
+    session.commit()
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("count", [1, 10, 50])
+def test_material_recommendation_list_is_one_query(
+    db_engine: Engine, session: Session, count: int,
+) -> None:
+    for user in create_users(session, count):
+        create_recommendations(session, user, 1)
+    session.expunge_all()
+
+    with count_statements(db_engine) as statements:
+        page = material_recommendation_list_service(
+            session=session,
+            admin=AdminUser(fullname="Admin", email="admin@example.com", password=None),
+            after=None,
+            limit=100,
+        )
+
+    assert len(page.items) == count
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("count", [1, 10, 50])
+def test_user_material_recommendation_list_is_one_query(
+    db_engine: Engine, session: Session, count: int,
+) -> None:
+    [user] = create_users(session, 1)
+    create_recommendations(session, user, count)
+    session.refresh(user)
+    session.expunge_all()
+
+    with count_statements(db_engine) as statements:
+        page = user_material_recommendation_list(
+            session=session, user=user, after=None, limit=100,
+        )
+
+    assert len(page.items) == count
+    assert len(statements) == 1
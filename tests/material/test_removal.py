@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import Engine, event
+from sqlmodel import Session, select
+
+from src.material.services import mark_material_for_removal_service
+from src.models import AdminUser, Material, MaterialRating, MaterialStatus, User
+
+
+@pytest.fixture
+def db_engine(db_engine: Engine) -> Engine:
+    # enforce foreign keys like postgresql does
+    event.listen(
+        db_engine,
+        "connect",
+        lambda connection, record: connection.execute("PRAGMA foreign_keys=ON"),
+    )
+    return db_engine
+
+
+@pytest.mark.parametrize(
+    "material_status", [MaterialStatus.vectorized, MaterialStatus.pending_vectorization],
+)
+def test_rated_material_is_marked_removed(
+    session: Session, material_status: MaterialStatus,
+) -> None:
+    material = Material(
+        title="Material", description="description", authors="author", status=material_status,
+    )
+    user = User(fullname="User", matric_number=1, email="user@example.com", password=None)
+    session.add(MaterialRating(material=material, user=user, rating=4))
+    session.commit()
+
+    mark_material_for_removal_service(
+        session=session,
+        admin=AdminUser(fullname="Admin", email="admin@example.com", password=None),
+        material_id=material.id,
+    )
+
+    session.expire_all()
+    assert session.get_one(Material, material.id).status == MaterialStatus.removed
+    assert session.exec(select(MaterialRating)).one().material_id == material.id
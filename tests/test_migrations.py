@@ -0,0 +1,151 @@
+import os
+import uuid
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from alembic.command import downgrade, upgrade
+from alembic.config import Config
+from sqlalchemy import Connection, Executable, create_engine, delete, event
+from sqlmodel import Session, col, func, select
+
+from src.material.schemas import Page
+from src.material.services import (
+    _encode_page_cursor,
+    admin_material_list_service,
+    material_pending_vectorization_list_service,
+    material_recommendation_list_service,
+    user_material_list_service,
+    user_material_recommendation_list,
+)
+from src.models import AdminUser, MaterialRating, User, UserMaterial
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def migration_config(connection: Connection) -> Config:
+    config = Config(ROOT_DIR / "alembic.ini")
+    config.set_main_option("script_location", str(ROOT_DIR / "src" / "alembic"))
+    config.attributes["connection"] = connection
+    return config
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def database_url(request, tmp_path) -> str:
+    """An empty database on every backend the migrations have to support."""
+    if request.param == "sqlite":
+        return f"sqlite:///{tmp_path / 'db.sqlite3'}"
+    if not (url := os.environ.get("TEST_POSTGRES_URI")):
+        pytest.skip("TEST_POSTGRES_URI is not set.")
+    return url
+
+
+@pytest.fixture
+def migrated_connection(tmp_path) -> Iterator[Connection]:
+    """A connection to a sqlite database upgraded to the latest migration."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    with engine.begin() as connection:
+        upgrade(migration_config(connection), "head")
+
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def test_migrations_upgrade_and_downgrade(database_url: str) -> None:
+    engine = create_engine(database_url)
+    try:
+        for revision in ["head", "base", "head"]:
+            with engine.begin() as connection:
+                migrate = upgrade if revision == "head" else downgrade
+                migrate(migration_config(connection), revision)
+    finally:
+        # leave the database as it was found
+        with engine.begin() as connection:
+            downgrade(migration_config(connection), "base")
+        engine.dispose()
+
+
+def query_plan(connection: Connection, statement: Executable) -> str:
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True},
+    )
+    # the plan does not depend on the values, only on the statement
+    parameters = tuple(str(compiled.params[name]) for name in compiled.positiontup or ())
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", parameters)
+    return "\n".join(row.detail for row in rows)
+
+
+def test_rating_count_by_material_uses_index(migrated_connection: Connection) -> None:
+    plan = query_plan(
+        migrated_connection,
+        select(func.count()).select_from(MaterialRating).where(
+            MaterialRating.material_id == uuid.uuid4(),
+        ),
+    )
+
+    assert "USING COVERING INDEX ix_materialrating_material_id" in plan
+
+
+@pytest.mark.parametrize("statement", [
+    select(UserMaterial).where(UserMaterial.material_id == uuid.uuid4()),
+    delete(UserMaterial).where(col(UserMaterial.material_id).in_([uuid.uuid4()])),
+])
+def test_user_material_lookup_by_material_uses_index(
+    migrated_connection: Connection, statement: Executable,
+) -> None:
+    plan = query_plan(migrated_connection, statement)
+
+    assert "USING INDEX ix_usermaterial_material_id" in plan
+
+
+def list_materials_page(service: Callable[..., Page]) -> Callable[[Session, str], Page]:
+    return lambda session, after: service(
+        session=session,
+        admin=AdminUser(fullname="Admin", email="admin@example.com", password=None),
+        after=after,
+        limit=25,
+    )
+
+
+def list_user_materials_page(service: Callable[..., Page]) -> Callable[[Session, str], Page]:
+    return lambda session, after: service(
+        session=session,
+        user=User(fullname="User", matric_number=1, email="user@example.com", password=None),
+        after=after,
+        limit=25,
+    )
+
+
+@pytest.mark.parametrize("list_page", [
+    list_materials_page(admin_material_list_service),
+    list_materials_page(material_pending_vectorization_list_service),
+    list_materials_page(material_recommendation_list_service),
+    list_user_materials_page(user_material_list_service),
+    list_user_materials_page(user_material_recommendation_list),
+])
+def test_material_list_pages_seek_status_created_datetime_index(
+    migrated_connection: Connection, list_page: Callable[[Session, str], Page],
+) -> None:
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(migrated_connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        list_page(
+            Session(migrated_connection),
+            _encode_page_cursor("2026-01-01 00:00:00", uuid.uuid4()),
+        )
+    finally:
+        event.remove(migrated_connection, "before_cursor_execute", before_cursor_execute)
+
+    [(statement, parameters)] = statements
+    rows = migrated_connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    plan = "\n".join(row.detail for row in rows)
+
+    assert "USING INDEX ix_material_status_created_datetime (status=? AND (created_datetime,id)>(?,?))" in plan
+    assert "SCAN material" not in plan
+    assert "TEMP B-TREE" not in plan